@@ -1,33 +1,66 @@
 import logging
+import voluptuous as vol
 from datetime import timedelta
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from .const import DOMAIN, DEFAULT_UPDATE_INTERVAL
+from .const import DOMAIN, DEFAULT_UPDATE_INTERVAL, EXPORT_FORMATS, SERVICE_EXPORT_CATALOGUE
 from .coordinator import DresdenGoldCoordinator
+from .export import ExportError
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor", "number", "switch"]
 
+EXPORT_CATALOGUE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("format"): vol.In([fmt for fmt in EXPORT_FORMATS if fmt != "none"]),
+    }
+)
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Dresden Gold from a config entry."""
     hass.data.setdefault(DOMAIN, {})
     coordinator = DresdenGoldCoordinator(hass, entry)
+    await coordinator.async_load_analytics()
     await coordinator.async_config_entry_first_refresh()
     hass.data[DOMAIN][entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
+    if not hass.services.has_service(DOMAIN, SERVICE_EXPORT_CATALOGUE):
+        async def async_export_catalogue(call: ServiceCall) -> ServiceResponse:
+            """Dump the unfiltered catalogue of every entry on demand."""
+            files = []
+            for coordinator in hass.data[DOMAIN].values():
+                try:
+                    files.append(await coordinator.async_dump_catalogue(call.data.get("format")))
+                except (ExportError, OSError) as err:
+                    raise HomeAssistantError(f"Catalogue export failed: {err}") from err
+            _LOGGER.info(f"Exported catalogue to {files}")
+            return {"files": files}
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_EXPORT_CATALOGUE,
+            async_export_catalogue,
+            schema=EXPORT_CATALOGUE_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_EXPORT_CATALOGUE)
     return unload_ok
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
\ No newline at end of file
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options without reloading the config entry."""
+    coordinator: DresdenGoldCoordinator = hass.data[DOMAIN][entry.entry_id]
+    await coordinator.async_apply_options(entry)
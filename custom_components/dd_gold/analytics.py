@@ -0,0 +1,221 @@
+import math
+from collections import deque
+from typing import Dict, List, Optional
+
+from .const import DEFAULT_UPDATE_INTERVAL
+
+EWMA_HALF_LIFE = 24 * 3600  # seconds
+DEPLETION_HALF_LIFE = 6 * 3600  # seconds
+LOW_WINDOWS = {"low_7d": 7 * 24 * 3600, "low_30d": 30 * 24 * 3600}
+PRODUCT_RETENTION = 30 * 24 * 3600  # forget products unseen for this long
+
+
+def decay_alpha(elapsed: float, half_life: float) -> float:
+    """Return the smoothing factor for an observation elapsed seconds after the last one."""
+    if elapsed <= 0:
+        return 0.0
+    return 1.0 - 0.5 ** (elapsed / half_life)
+
+
+def product_key(weight: str, coin: dict) -> str:
+    """Return the key identifying a product across refreshes, its URL if it has one."""
+    return coin.get("url") or f"{weight}:{coin['name']}"
+
+
+class WindowMinimum:
+    """Sliding-window minimum kept in a monotonic deque of (timestamp, value)."""
+
+    def __init__(self, window: float, items: Optional[List[List[float]]] = None) -> None:
+        """Initialize the window, optionally from persisted items."""
+        self.window = window
+        self.items = deque(tuple(item) for item in items or [])
+
+    def push(self, timestamp: float, value: float) -> None:
+        """Add an observation and drop values that can no longer be the minimum."""
+        while self.items and self.items[-1][1] >= value:
+            self.items.pop()
+        self.items.append((timestamp, value))
+        while self.items[0][0] <= timestamp - self.window:
+            self.items.popleft()
+
+    @property
+    def minimum(self) -> Optional[float]:
+        return self.items[0][1] if self.items else None
+
+    def as_list(self) -> List[List[float]]:
+        return [list(item) for item in self.items]
+
+
+class WeightAnalytics:
+    """Incremental trend statistics of the cheapest price of one weight."""
+
+    def __init__(self, state: Optional[dict] = None) -> None:
+        """Initialize from persisted state."""
+        state = state or {}
+        self.last_time: Optional[float] = state.get("last_time")
+        self.last_price: Optional[float] = state.get("last_price")
+        self.ewma: Optional[float] = state.get("ewma")
+        # Exponentially weighted sums of the weights, squared weights, returns and
+        # squared returns. Normalising by the weight sums removes the start-up bias.
+        self.return_weight: float = state.get("return_weight", 0.0)
+        self.return_weight_sq: float = state.get("return_weight_sq", 0.0)
+        self.return_sum: float = state.get("return_sum", 0.0)
+        self.return_sq_sum: float = state.get("return_sq_sum", 0.0)
+        self.samples: int = state.get("samples", 0)
+        self.lows = {
+            key: WindowMinimum(window, state.get(key))
+            for key, window in LOW_WINDOWS.items()
+        }
+
+    def update(self, timestamp: float, price: float) -> None:
+        """Fold one cheapest-price observation into the running statistics."""
+        if self.last_time is None:
+            self.ewma = price
+        else:
+            elapsed = timestamp - self.last_time
+            self.ewma += decay_alpha(elapsed, EWMA_HALF_LIFE) * (price - self.ewma)
+            # Log returns are scaled to one refresh interval so a long gap (e.g. after
+            # a restart) is not a single step.
+            alpha = decay_alpha(elapsed, EWMA_HALF_LIFE)
+            log_return = math.log(price / self.last_price) / math.sqrt(max(elapsed, 1) / DEFAULT_UPDATE_INTERVAL)
+            keep = 1.0 - alpha
+            self.return_weight = keep * self.return_weight + alpha
+            self.return_weight_sq = keep * keep * self.return_weight_sq + alpha * alpha
+            self.return_sum = keep * self.return_sum + alpha * log_return
+            self.return_sq_sum = keep * self.return_sq_sum + alpha * log_return * log_return
+        for window in self.lows.values():
+            window.push(timestamp, price)
+        self.last_time = timestamp
+        self.last_price = price
+        self.samples += 1
+
+    @property
+    def volatility(self) -> float:
+        """Return the standard deviation of price returns per refresh interval in percent."""
+        if not self.return_weight:
+            return 0.0
+        mean = self.return_sum / self.return_weight
+        variance = self.return_sq_sum / self.return_weight - mean * mean
+        # Bessel's correction for weighted samples, 1 - sum(w^2) / sum(w)^2 is
+        # (n - 1) / n for n equally weighted returns and 0 for a single one.
+        correction = 1.0 - self.return_weight_sq / (self.return_weight * self.return_weight)
+        if correction <= 1e-9:
+            return 0.0
+        return math.sqrt(max(variance, 0.0) / correction) * 100.0
+
+    def as_dict(self) -> dict:
+        return {
+            "last_time": self.last_time,
+            "last_price": self.last_price,
+            "ewma": self.ewma,
+            "return_weight": self.return_weight,
+            "return_weight_sq": self.return_weight_sq,
+            "return_sum": self.return_sum,
+            "return_sq_sum": self.return_sq_sum,
+            "samples": self.samples,
+            **{key: window.as_list() for key, window in self.lows.items()},
+        }
+
+
+class ProductDepletion:
+    """Smoothed rate at which the stock of one product sells out."""
+
+    def __init__(self, state: dict) -> None:
+        """Initialize from persisted state."""
+        self.name: str = state.get("name", "")
+        self.weight_code: str = state.get("weight_code", "")
+        self.last_time: float = state["last_time"]
+        self.qty: int = state["qty"]
+        self.rate: Optional[float] = state.get("rate")
+
+    def update(self, timestamp: float, qty: int) -> None:
+        """Fold a new stock level into the depletion rate in units per hour."""
+        elapsed = timestamp - self.last_time
+        if elapsed <= 0:
+            return
+        if qty <= self.qty:
+            observed = (self.qty - qty) / (elapsed / 3600)
+            if self.rate is None:
+                self.rate = observed
+            else:
+                self.rate += decay_alpha(elapsed, DEPLETION_HALF_LIFE) * (observed - self.rate)
+        # A restock carries no information about demand, only the level is reset.
+        self.qty = qty
+        self.last_time = timestamp
+
+    @property
+    def hours_left(self) -> Optional[float]:
+        if not self.rate:
+            return None
+        return self.qty / self.rate
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "weight_code": self.weight_code,
+            "last_time": self.last_time,
+            "qty": self.qty,
+            "rate": self.rate,
+        }
+
+
+class DresdenGoldAnalytics:
+    """Rolling analytics updated once per refresh in O(1) per metric."""
+
+    def __init__(self, state: Optional[dict] = None) -> None:
+        """Initialize from persisted state."""
+        state = state or {}
+        self.weights: Dict[str, WeightAnalytics] = {
+            weight: WeightAnalytics(weight_state)
+            for weight, weight_state in state.get("weights", {}).items()
+        }
+        self.products: Dict[str, ProductDepletion] = {
+            key: ProductDepletion(product_state)
+            for key, product_state in state.get("products", {}).items()
+        }
+        self.last_update: Optional[float] = state.get(
+            "last_update", max((p.last_time for p in self.products.values()), default=None)
+        )
+
+    def update(self, timestamp: float, catalogue: Dict[str, List[dict]]) -> None:
+        """Update the statistics from the raw catalogue of a refresh.
+
+        The trends follow the cheapest available coin of every weight, independent
+        of the price and tax filters the user can change at any time.
+        """
+        for weight, coins in catalogue.items():
+            prices = [float(coin["price"]) for coin in coins if coin.get("available", True)]
+            if prices:
+                self.weights.setdefault(weight, WeightAnalytics()).update(timestamp, min(prices))
+
+            for coin in coins:
+                if not coin.get("qty"):
+                    continue
+                qty = int(coin["qty"])
+                key = product_key(weight, coin)
+                product = self.products.get(key)
+                if product is None:
+                    self.products[key] = ProductDepletion(
+                        {"name": coin["name"], "weight_code": weight, "last_time": timestamp, "qty": qty}
+                    )
+                else:
+                    product.update(timestamp, qty)
+
+        for key in [key for key, p in self.products.items() if p.last_time <= timestamp - PRODUCT_RETENTION]:
+            del self.products[key]
+        self.last_update = timestamp
+
+    def depletion(self, weight: str) -> List[ProductDepletion]:
+        """Return the products of a weight listed in the latest refresh, fastest selling first."""
+        products = [
+            p for p in self.products.values()
+            if p.weight_code == weight and p.rate is not None and p.last_time == self.last_update
+        ]
+        return sorted(products, key=lambda p: p.rate, reverse=True)
+
+    def as_dict(self) -> dict:
+        return {
+            "weights": {weight: stats.as_dict() for weight, stats in self.weights.items()},
+            "products": {key: product.as_dict() for key, product in self.products.items()},
+            "last_update": self.last_update,
+        }
@@ -10,12 +10,31 @@ from .const import (
     CONF_MAX_PRICE,
     CONF_MAX_COINS,
     CONF_REQUIRE_ZERO_TAX,
+    CONF_EXPORT_FORMAT,
+    CONF_EXPORT_MAX_SIZE,
+    CONF_EXPORT_ROTATE_HOURS,
+    CONF_SPOT_ENTITY,
+    CONF_SPOT_PRICE,
+    CONF_WEIGHTS,
+    CONF_BACKEND,
+    CONF_FEED_URL,
     DEFAULT_MIN_PRICE,
     DEFAULT_MAX_PRICE,
     DEFAULT_MAX_COINS,
     DEFAULT_REQUIRE_ZERO_TAX,
+    DEFAULT_EXPORT_FORMAT,
+    DEFAULT_EXPORT_MAX_SIZE,
+    DEFAULT_EXPORT_ROTATE_HOURS,
+    DEFAULT_SPOT_PRICE,
+    DEFAULT_BACKEND,
+    BACKENDS,
+    EXPORT_FORMATS,
+    WEIGHT_CODES,
+    WEIGHT_DISPLAY,
 )
 
+OPTIONAL_KEYS = (CONF_SPOT_ENTITY, CONF_FEED_URL)
+
 class DresdenGoldConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Dresden Gold."""
 
@@ -72,6 +91,69 @@ class DresdenGoldConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_REQUIRE_ZERO_TAX,
                     default=defaults.get(CONF_REQUIRE_ZERO_TAX, DEFAULT_REQUIRE_ZERO_TAX),
                 ): selector.BooleanSelector(),
+                vol.Required(
+                    CONF_WEIGHTS,
+                    default=defaults.get(CONF_WEIGHTS, WEIGHT_CODES),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[
+                            selector.SelectOptionDict(value=weight, label=WEIGHT_DISPLAY[weight])
+                            for weight in WEIGHT_CODES
+                        ],
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.LIST,
+                    )
+                ),
+                vol.Required(
+                    CONF_BACKEND,
+                    default=defaults.get(CONF_BACKEND, DEFAULT_BACKEND),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=BACKENDS, mode=selector.SelectSelectorMode.DROPDOWN
+                    )
+                ),
+                vol.Optional(
+                    CONF_FEED_URL,
+                    description={"suggested_value": defaults.get(CONF_FEED_URL)},
+                ): selector.TextSelector(),
+                vol.Optional(
+                    CONF_SPOT_ENTITY,
+                    description={"suggested_value": defaults.get(CONF_SPOT_ENTITY)},
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain=["sensor", "input_number"])
+                ),
+                vol.Required(
+                    CONF_SPOT_PRICE,
+                    default=defaults.get(CONF_SPOT_PRICE, DEFAULT_SPOT_PRICE),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0, max=10000, step=0.01, unit_of_measurement="€/oz", mode=selector.NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Required(
+                    CONF_EXPORT_FORMAT,
+                    default=defaults.get(CONF_EXPORT_FORMAT, DEFAULT_EXPORT_FORMAT),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=EXPORT_FORMATS, mode=selector.SelectSelectorMode.DROPDOWN
+                    )
+                ),
+                vol.Required(
+                    CONF_EXPORT_MAX_SIZE,
+                    default=defaults.get(CONF_EXPORT_MAX_SIZE, DEFAULT_EXPORT_MAX_SIZE),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0, max=1000, step=1, unit_of_measurement="MB", mode=selector.NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Required(
+                    CONF_EXPORT_ROTATE_HOURS,
+                    default=defaults.get(CONF_EXPORT_ROTATE_HOURS, DEFAULT_EXPORT_ROTATE_HOURS),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0, max=720, step=1, unit_of_measurement="h", mode=selector.NumberSelectorMode.BOX
+                    )
+                ),
             }
         )
 
@@ -87,9 +169,12 @@ class DresdenGoldOptionsFlow(config_entries.OptionsFlow):
     ) -> FlowResult:
         """Manage the options."""
         if user_input is not None:
+            # Cleared optional fields are left out of user_input, store them explicitly
+            # so they override a value set in the initial config flow.
+            user_input = {key: "" for key in OPTIONAL_KEYS} | user_input
             return self.async_create_entry(title="", data=user_input)
 
         return self.async_show_form(
             step_id="init",
-            data_schema=DresdenGoldConfigFlow._get_data_schema(self.config_entry.data)
+            data_schema=DresdenGoldConfigFlow._get_data_schema({**self.config_entry.data, **self.config_entry.options})
         )
\ No newline at end of file
@@ -5,12 +5,39 @@ CONF_MAX_PRICE = "max_price"
 CONF_MAX_COINS = "max_coins"
 CONF_REQUIRE_ZERO_TAX = "require_zero_tax"
 CONF_UPDATE_INTERVAL = "update_interval"
+CONF_EXPORT_FORMAT = "export_format"
+CONF_EXPORT_MAX_SIZE = "export_max_size"
+CONF_EXPORT_ROTATE_HOURS = "export_rotate_hours"
+CONF_SPOT_ENTITY = "spot_entity"
+CONF_SPOT_PRICE = "spot_price"
+CONF_WEIGHTS = "weights"
+CONF_BACKEND = "backend"
+CONF_FEED_URL = "feed_url"
 
 DEFAULT_MIN_PRICE = 15.0
 DEFAULT_MAX_PRICE = 100.0
 DEFAULT_MAX_COINS = 100
 DEFAULT_REQUIRE_ZERO_TAX = False
 DEFAULT_UPDATE_INTERVAL = 300  # seconds
+DEFAULT_EXPORT_FORMAT = "none"
+DEFAULT_EXPORT_MAX_SIZE = 10  # MB, 0 disables size rotation
+DEFAULT_EXPORT_ROTATE_HOURS = 24  # 0 disables time rotation
+DEFAULT_SPOT_PRICE = 0.0  # €/oz, 0 disables the premium over spot
+DEFAULT_BACKEND = "html"
+DEFAULT_FEED_URL = ""
+DEFAULT_VAT_RATE = 19.0  # %, assumed when a feed states neither a rate nor zero tax
+
+BACKENDS = ["html", "feed"]
+
+EXPORT_FORMATS = ["none", "ndjson", "csv", "parquet"]
+EXPORT_DIR = "dd_gold_export"
+
+SERVICE_EXPORT_CATALOGUE = "export_catalogue"
+
+ANALYTICS_STORAGE_VERSION = 1
+ANALYTICS_SAVE_DELAY = 60  # seconds
+
+SIGNAL_WEIGHTS_UPDATED = f"{DOMAIN}_weights_updated_{{}}"
 
 WEIGHT_CODES = ["0.5_oz", "1_oz", "1.5_oz", "2_oz", "5_oz", "10_oz"]
 WEIGHT_DISPLAY = {
@@ -20,4 +47,20 @@ WEIGHT_DISPLAY = {
     "2_oz": "2 oz",
     "5_oz": "5 oz",
     "10_oz": "10 oz"
-}
\ No newline at end of file
+}
+WEIGHT_SLUGS = {
+    "0.5_oz": "1-2-unze",
+    "1_oz": "1-unze",
+    #"1.5_oz": "1-5-unzen",
+    "2_oz": "2-unzen",
+    "5_oz": "5-unzen",
+    "10_oz": "10-unzen",
+}
+WEIGHT_OUNCES = {
+    "0.5_oz": 0.5,
+    "1_oz": 1.0,
+    "1.5_oz": 1.5,
+    "2_oz": 2.0,
+    "5_oz": 5.0,
+    "10_oz": 10.0
+}
@@ -7,9 +7,21 @@ from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from homeassistant.util.dt import utcnow
 from collections import defaultdict
+from xml.etree.ElementTree import ParseError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
 from .const import DOMAIN, WEIGHT_CODES, WEIGHT_DISPLAY, CONF_MIN_PRICE, CONF_MAX_PRICE, CONF_MAX_COINS, CONF_REQUIRE_ZERO_TAX, DEFAULT_UPDATE_INTERVAL, DEFAULT_MIN_PRICE, DEFAULT_MAX_PRICE, DEFAULT_REQUIRE_ZERO_TAX, DEFAULT_MAX_COINS
+from .const import CONF_EXPORT_FORMAT, CONF_EXPORT_MAX_SIZE, CONF_EXPORT_ROTATE_HOURS, DEFAULT_EXPORT_FORMAT, DEFAULT_EXPORT_MAX_SIZE, DEFAULT_EXPORT_ROTATE_HOURS, EXPORT_DIR
+from .const import CONF_SPOT_ENTITY, CONF_SPOT_PRICE, DEFAULT_SPOT_PRICE, CONF_WEIGHTS, WEIGHT_SLUGS, SIGNAL_WEIGHTS_UPDATED
+from .const import ANALYTICS_STORAGE_VERSION, ANALYTICS_SAVE_DELAY
+from .const import CONF_BACKEND, CONF_FEED_URL, DEFAULT_BACKEND, DEFAULT_FEED_URL, DEFAULT_VAT_RATE
+from .analytics import DresdenGoldAnalytics
+from .export import CatalogueExporter, ExportError, iter_catalogue_records
+from .feeds import FEED_CHUNK_SIZE, ProductFeedParser, classify_weight, parse_feed_file
+from .pricing import CatalogueFrame, TROY_OUNCE_GRAMS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,55 +37,203 @@ class DresdenGoldCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=DEFAULT_UPDATE_INTERVAL),
         )
         self.entry = entry
-        self.min_price = entry.data.get(CONF_MIN_PRICE, DEFAULT_MIN_PRICE)
-        self.max_price = entry.data.get(CONF_MAX_PRICE, DEFAULT_MAX_PRICE)
-        self.max_coins = int(entry.data.get(CONF_MAX_COINS, DEFAULT_MAX_COINS))
-        self.require_zero_tax = entry.data.get(CONF_REQUIRE_ZERO_TAX, DEFAULT_REQUIRE_ZERO_TAX)
+        config = {**entry.data, **entry.options}
         self.base_url = "https://www.dresden.gold"
         self.session = aiohttp.ClientSession(headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'})
         self.last_update_success_time: Optional[datetime] = None
+        self.catalogue: Dict[str, List[Dict[str, str]]] = {}
+        self.exporter: Optional[CatalogueExporter] = None
+        self.spot_entity: Optional[str] = None
+        self._unsub_spot_entity = None
+        self.weights = [w for w in WEIGHT_CODES if w in config.get(CONF_WEIGHTS, WEIGHT_CODES)]
+        self.analytics = DresdenGoldAnalytics()
+        self._analytics_store = Store(hass, ANALYTICS_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.analytics")
+        self.apply_config(config)
 
     async def _async_update_data(self) -> dict:
         """Fetch data from API."""
         try:
-            weight_slugs = {
-                "0.5_oz": "1-2-unze",
-                "1_oz": "1-unze",
-                #"1.5_oz": "1-5-unzen",
-                "2_oz": "2-unzen",
-                "5_oz": "5-unzen",
-                "10_oz": "10-unzen",
-            }
-
-            async def fetch_weight(weight):
-                if weight not in weight_slugs:
-                    return weight, {}
-                slug = weight_slugs[weight]
-                category_url = f"{self.base_url}/silber/silbermuenzen/{slug}.html?limit=all"
-                _LOGGER.debug(f"Fetch {weight=}: {category_url}")
-                coins = await self.scrape_coins_for_weight(weight, category_url)
-                group_coins = sorted(coins, key=lambda x: float(x['price']))[:self.max_coins]
-                if group_coins:
-                    prices = [float(c['price']) for c in group_coins]
-                    return weight, {
-                        "coins": group_coins,
-                        "min_price": min(prices),
-                        "max_price": max(prices),
-                        "average_price": sum(prices) / len(prices),
-                        "total_coins": len(group_coins),
-                    }
-                return weight, {}
-
-            tasks = [fetch_weight(weight) for weight in WEIGHT_CODES]
-            results = await asyncio.gather(*tasks)
-            data = {weight: info for weight, info in results if info}
+            await self.async_fetch_catalogue(self.weights)
+            data = self.derive_data()
         except Exception as err:
             _LOGGER.error(f"Error fetching data: {repr(err)}")
             raise UpdateFailed(f"Error fetching data: {err}")
         else:
             self.last_update_success_time = utcnow()
+            self.analytics.update(self.last_update_success_time.timestamp(), self.catalogue)
+            self._analytics_store.async_delay_save(self.analytics.as_dict, ANALYTICS_SAVE_DELAY)
+            if self.exporter:
+                await self.async_export_catalogue()
             return data
 
+    async def async_fetch_catalogue(self, weights) -> None:
+        """Scrape the given weight categories into the cached catalogue."""
+        if self.backend == "feed":
+            coins = await self.fetch_feed_coins(self.feed_url)
+            self.catalogue.update(
+                (weight, [c for c in coins if c["weight_code"] == weight])
+                for weight in weights
+            )
+            return
+
+        async def fetch_weight(weight):
+            slug = WEIGHT_SLUGS[weight]
+            category_url = f"{self.base_url}/silber/silbermuenzen/{slug}.html?limit=all"
+            _LOGGER.debug(f"Fetch {weight=}: {category_url}")
+            return weight, await self.scrape_coins_for_weight(weight, category_url)
+
+        tasks = [fetch_weight(weight) for weight in weights if weight in WEIGHT_SLUGS]
+        results = await asyncio.gather(*tasks)
+        self.catalogue.update(results)
+
+    def apply_config(self, config: dict) -> None:
+        """Apply filter, spot price and export settings from the entry config."""
+        self.min_price = config.get(CONF_MIN_PRICE, DEFAULT_MIN_PRICE)
+        self.max_price = config.get(CONF_MAX_PRICE, DEFAULT_MAX_PRICE)
+        self.max_coins = int(config.get(CONF_MAX_COINS, DEFAULT_MAX_COINS))
+        self.require_zero_tax = config.get(CONF_REQUIRE_ZERO_TAX, DEFAULT_REQUIRE_ZERO_TAX)
+        self.track_spot_entity(config.get(CONF_SPOT_ENTITY) or None)
+        self.spot_price = float(config.get(CONF_SPOT_PRICE, DEFAULT_SPOT_PRICE))
+        self.exporter = self._create_exporter(config, self.exporter)
+        self.backend = config.get(CONF_BACKEND, DEFAULT_BACKEND)
+        self.feed_url = config.get(CONF_FEED_URL, DEFAULT_FEED_URL)
+
+    async def async_apply_options(self, entry) -> None:
+        """Apply changed options in place, keeping the cached catalogue."""
+        config = {**entry.data, **entry.options}
+        source = (self.backend, self.feed_url)
+        exporter = self.exporter
+        self.apply_config(config)
+        if exporter and exporter is not self.exporter:
+            await self.hass.async_add_executor_job(exporter.close)
+
+        weights = [w for w in WEIGHT_CODES if w in config.get(CONF_WEIGHTS, WEIGHT_CODES)]
+        added = [w for w in weights if w not in self.weights]
+        removed = [w for w in self.weights if w not in weights]
+        self.weights = weights
+        for weight in removed:
+            self.catalogue.pop(weight, None)
+        if source != (self.backend, self.feed_url):
+            # A new ingestion source invalidates the whole cached catalogue.
+            await self.async_fetch_catalogue(weights)
+        elif added:
+            await self.async_fetch_catalogue(added)
+
+        self.async_set_updated_data(self.derive_data())
+        if added or removed:
+            _LOGGER.debug(f"Weights changed: {added=}, {removed=}")
+            async_dispatcher_send(self.hass, SIGNAL_WEIGHTS_UPDATED.format(entry.entry_id), added, removed)
+
+    async def async_load_analytics(self) -> None:
+        """Restore the rolling analytics state persisted by a previous run."""
+        state = await self._analytics_store.async_load()
+        if state:
+            self.analytics = DresdenGoldAnalytics(state)
+
+    async def async_shutdown(self) -> None:
+        """Cancel refreshes, persist the analytics, finalise exports and close the HTTP session."""
+        await super().async_shutdown()
+        self.track_spot_entity(None)
+        await self._analytics_store.async_save(self.analytics.as_dict())
+        if self.exporter:
+            await self.hass.async_add_executor_job(self.exporter.close)
+        await self.session.close()
+
+    def _create_exporter(self, config: dict, current: Optional[CatalogueExporter] = None) -> Optional[CatalogueExporter]:
+        fmt = config.get(CONF_EXPORT_FORMAT, DEFAULT_EXPORT_FORMAT)
+        if fmt == "none":
+            return None
+        exporter = CatalogueExporter(
+            self.hass.config.path(EXPORT_DIR),
+            fmt,
+            max_size=float(config.get(CONF_EXPORT_MAX_SIZE, DEFAULT_EXPORT_MAX_SIZE)),
+            rotate_hours=float(config.get(CONF_EXPORT_ROTATE_HOURS, DEFAULT_EXPORT_ROTATE_HOURS)),
+        )
+        if current and (current.fmt, current.max_bytes, current.rotate_interval) == (exporter.fmt, exporter.max_bytes, exporter.rotate_interval):
+            # Unchanged settings keep appending to the current file.
+            return current
+        return exporter
+
+    async def async_export_catalogue(self) -> None:
+        """Append the unfiltered catalogue of the last refresh to the export files."""
+        fetched_at = self.last_update_success_time or utcnow()
+        records = iter_catalogue_records(dict(self.catalogue), fetched_at)
+        try:
+            await self.hass.async_add_executor_job(self.exporter.write, records, fetched_at)
+        except (ExportError, OSError) as err:
+            _LOGGER.warning(f"Catalogue export failed: {err}")
+
+    async def async_dump_catalogue(self, fmt: Optional[str] = None) -> str:
+        """Write the current unfiltered catalogue to a snapshot file."""
+        exporter = self.exporter or CatalogueExporter(self.hass.config.path(EXPORT_DIR), fmt or "ndjson")
+        fetched_at = self.last_update_success_time or utcnow()
+        records = iter_catalogue_records(dict(self.catalogue), fetched_at)
+        return await self.hass.async_add_executor_job(exporter.dump, records, utcnow(), fmt)
+
+    def track_spot_entity(self, entity_id: Optional[str]) -> None:
+        """Re-rank the cached catalogue whenever the spot price entity changes."""
+        if entity_id == self.spot_entity and (self._unsub_spot_entity or not entity_id):
+            return
+        if self._unsub_spot_entity:
+            self._unsub_spot_entity()
+            self._unsub_spot_entity = None
+        self.spot_entity = entity_id
+        if entity_id:
+            self._unsub_spot_entity = async_track_state_change_event(
+                self.hass, [entity_id], self._async_spot_price_changed
+            )
+
+    @callback
+    def _async_spot_price_changed(self, event: Event) -> None:
+        if self.data is None:
+            return
+        # Not async_set_updated_data, which would postpone the next scrape on every spot tick.
+        self.data = self.derive_data()
+        self.async_update_listeners()
+
+    def get_spot_price(self) -> Optional[float]:
+        """Return the spot price in €/oz from the configured entity or fixed value."""
+        if self.spot_entity:
+            state = self.hass.states.get(self.spot_entity)
+            try:
+                spot_price = float(state.state)
+            except (AttributeError, TypeError, ValueError):
+                _LOGGER.debug(f"Spot price entity {self.spot_entity} has no numeric state")
+            else:
+                unit = str(state.attributes.get("unit_of_measurement", "")).lower()
+                return spot_price * TROY_OUNCE_GRAMS if unit.endswith("/g") else spot_price
+        return self.spot_price or None
+
+    def derive_data(self) -> dict:
+        """Rank and normalise the cached catalogue in one vectorized pass."""
+        frame = CatalogueFrame.from_catalogue(self.catalogue)
+        spot_price = self.get_spot_price()
+        frame.apply_spot_price(spot_price)
+        mask = frame.mask(self.min_price, self.max_price, self.require_zero_tax)
+
+        data = {}
+        for weight in self.catalogue:
+            indices = frame.ranked(mask, frame.price, weight)[:self.max_coins]
+            if len(indices):
+                prices = frame.price[indices]
+                data[weight] = {
+                    "coins": [frame.coin(i) for i in indices],
+                    "min_price": float(prices.min()),
+                    "max_price": float(prices.max()),
+                    "average_price": float(prices.mean()),
+                    "total_coins": len(indices),
+                }
+
+        best_value = frame.ranked(mask, frame.price_per_oz)[:self.max_coins]
+        best_net_value = frame.ranked(mask, frame.net_price_per_oz)[:1]
+        data["overall"] = {
+            "best_value": [frame.coin(i) for i in best_value],
+            "best_net_value": frame.coin(best_net_value[0]) if len(best_net_value) else None,
+            "spot_price": spot_price,
+            "total_coins": int(mask.sum()),
+        }
+        return data
+
     def update_config(self, min_price=None, max_price=None, max_coins=None, require_zero_tax=None):
         """Update configuration values."""
         if min_price is not None:
@@ -84,7 +244,7 @@ class DresdenGoldCoordinator(DataUpdateCoordinator):
             self.max_coins = int(max_coins)
         if require_zero_tax is not None:
             self.require_zero_tax = require_zero_tax
-        self.async_set_updated_data(self.data)  # Trigger refresh
+        self.async_set_updated_data(self.derive_data())  # Re-rank the cached catalogue
 
     async def scrape_coins_for_weight(self, weight_code: str, url: str) -> List[Dict[str, str]]:
         soup = await self.fetch_page(url)
@@ -137,12 +297,6 @@ class DresdenGoldCoordinator(DataUpdateCoordinator):
 
                 is_zero_tax = mwst_price==0.0 or self.is_zero_tax(item)
                 _LOGGER.debug(f"{is_zero_tax=}")
-                if self.require_zero_tax and not is_zero_tax:
-                    continue
-
-                if not (self.min_price <= price <= self.max_price):
-                    continue
-
 
                 avail_el = item.select_one('span.regular-price').select_one('link[itemprop="availability"]')
                 _LOGGER.debug(f"{avail_el=}")
@@ -151,8 +305,7 @@ class DresdenGoldCoordinator(DataUpdateCoordinator):
 
                 is_available, qty, available_label = self.parse_availability_text(item)
                 _LOGGER.debug(f"{is_available}, {qty=}, {available_label=}")
-                if not is_available or (qty is not None and qty <= 0):
-                    continue
+                is_available = is_available and not (qty is not None and qty <= 0)
 
                 name = self.clean_name(name)
                 if not self.is_valid_coin_name(name):
@@ -165,6 +318,8 @@ class DresdenGoldCoordinator(DataUpdateCoordinator):
                     "weight": WEIGHT_DISPLAY.get(weight_code, "Unknown"),
                     "weight_code": weight_code,
                     "tax_rate": f"{round(mwst_price/(price-mwst_price) if price else 0.0,2)}",
+                    "zero_tax": is_zero_tax,
+                    "available": is_available,
                     "availability": available_label,
                     "qty": str(qty) if qty is not None else "",
                     "url": item_url,
@@ -178,6 +333,78 @@ class DresdenGoldCoordinator(DataUpdateCoordinator):
         _LOGGER.debug(f"Scraped {len(coins)} coins for weight {weight_code}")
         return coins
 
+    async def fetch_feed_coins(self, url: str) -> List[Dict[str, str]]:
+        """Download a structured product feed once and map it onto all weights."""
+        if not url:
+            _LOGGER.warning("Feed backend selected but no feed URL configured")
+            return []
+        if not url.startswith(("http://", "https://")):
+            try:
+                products = await self.hass.async_add_executor_job(parse_feed_file, url)
+            except (OSError, ParseError, ValueError) as e:
+                _LOGGER.warning(f"Feed error for {url}: {e}")
+                return []
+        else:
+            products = []
+            try:
+                async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as response:
+                    if response.status != 200:
+                        _LOGGER.warning(f"Failed to fetch {url}: status {response.status}")
+                        return []
+                    parser = ProductFeedParser()
+                    async for chunk in response.content.iter_chunked(FEED_CHUNK_SIZE):
+                        products.extend(parser.feed(chunk))
+                    products.extend(parser.close())
+            except (aiohttp.ClientError, asyncio.TimeoutError, ParseError, ValueError) as e:
+                _LOGGER.warning(f"Feed error for {url}: {e}")
+                return []
+
+        if not products:
+            _LOGGER.warning(f"Feed {url} contained no products")
+        _LOGGER.info(f"Feed products: {len(products)}")
+        coins = []
+        for product in products:
+            coin = self.coin_from_feed_product(product)
+            if coin:
+                coins.append(coin)
+        _LOGGER.debug(f"Parsed {len(coins)} coins from feed {url}")
+        return coins
+
+    def coin_from_feed_product(self, product: dict) -> Optional[Dict[str, str]]:
+        """Map a raw feed product onto the coin dict produced by the HTML scraper."""
+        text = f"{product['name']} {product['category']}"
+        if not any(k in text.lower() for k in ['silber', 'silver']):
+            return None
+        weight_code = classify_weight(text)
+        name = self.clean_name(product["name"])
+        price = product["price"]
+        if weight_code is None or price <= 0 or not self.is_valid_coin_name(name):
+            return None
+
+        # Only the structured tax field counts, free-form feed text is not reliable.
+        is_zero_tax = product["tax_rate"] == 0
+        tax_rate = 0.0 if is_zero_tax else (product["tax_rate"] or DEFAULT_VAT_RATE)
+        mwst_price = price * tax_rate / (100 + tax_rate)
+        qty = product["qty"]
+        is_available = product["in_stock"] is not False and not (qty is not None and qty <= 0)
+        url = product["url"]
+        if url and not url.startswith('http'):
+            url = self.base_url + url
+
+        return {
+            "name": name,
+            "price": f"{round(price, 2):.2f}",
+            "mwst_price": f"{round(mwst_price, 2):.2f}",
+            "weight": WEIGHT_DISPLAY.get(weight_code, "Unknown"),
+            "weight_code": weight_code,
+            "tax_rate": f"{round(mwst_price/(price-mwst_price),2)}",
+            "zero_tax": is_zero_tax,
+            "available": is_available,
+            "availability": "Nicht verfügbar" if not is_available else "Auf Lager" if product["in_stock"] or qty else "Verfügbarkeit unbekannt",
+            "qty": str(qty) if qty is not None else "",
+            "url": url,
+        }
+
     # async def fetch_page(self) -> Optional[BeautifulSoup]:
     #     try:
     #         async with self.session.get(self.target_url, timeout=12) as response:
@@ -0,0 +1,234 @@
+import csv
+import json
+import logging
+import os
+from itertools import islice
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_FIELDS = [
+    "fetched_at",
+    "weight_code",
+    "weight",
+    "name",
+    "price",
+    "mwst_price",
+    "tax_rate",
+    "zero_tax",
+    "available",
+    "availability",
+    "qty",
+    "url",
+]
+
+FILE_EXTENSIONS = {
+    "ndjson": "ndjson",
+    "csv": "csv",
+    "parquet": "parquet",
+}
+
+PARQUET_BATCH_SIZE = 1000  # records per Parquet record batch
+
+
+class ExportError(Exception):
+    """Raised when the catalogue cannot be exported."""
+
+
+def iter_catalogue_records(catalogue: Dict[str, List[dict]], fetched_at: datetime) -> Iterator[dict]:
+    """Yield one flat, typed record per coin of the unfiltered catalogue."""
+    timestamp = fetched_at.isoformat()
+    for weight_code, coins in catalogue.items():
+        for coin in coins:
+            qty = coin.get("qty", "")
+            yield {
+                "fetched_at": timestamp,
+                "weight_code": weight_code,
+                "weight": coin.get("weight"),
+                "name": coin.get("name"),
+                "price": float(coin["price"]),
+                "mwst_price": float(coin["mwst_price"]),
+                "tax_rate": float(coin["tax_rate"]),
+                "zero_tax": bool(coin.get("zero_tax", False)),
+                "available": bool(coin.get("available", True)),
+                "availability": coin.get("availability"),
+                "qty": int(qty) if qty not in ("", None) else None,
+                "url": coin.get("url"),
+            }
+
+
+class CatalogueExporter:
+    """Append catalogue records to size- or time-rotated files.
+
+    Parquet files cannot be appended to once closed, so a writer stays open for
+    the whole rotation period and is only finalised on rotation or close().
+    All methods do blocking file IO and must run in the executor.
+    """
+
+    def __init__(self, directory: str, fmt: str, max_size: float = 0, rotate_hours: float = 0) -> None:
+        """Initialize the exporter."""
+        if fmt not in FILE_EXTENSIONS:
+            raise ExportError(f"Unsupported export format: {fmt}")
+        self.directory = directory
+        self.fmt = fmt
+        self.max_bytes = int(max_size * 1024 * 1024) if max_size else 0
+        self.rotate_interval = timedelta(hours=rotate_hours) if rotate_hours else None
+        self._path: Optional[str] = None
+        self._opened_at: Optional[datetime] = None
+        self._parquet: Optional[_ParquetFile] = None
+
+    def write(self, records: Iterable[dict], now: datetime) -> int:
+        """Append records to the current file, rotating it when due."""
+        os.makedirs(self.directory, exist_ok=True)
+        if self._should_rotate(now):
+            self._rotate(self._new_path("catalogue", now), now)
+        if self.fmt == "parquet":
+            return self._write_parquet(records, now)
+
+        count = 0
+        handle = open(self._path, "a", newline="", encoding="utf-8")
+        try:
+            write_record = _record_writer(self.fmt, handle)
+            for record in records:
+                # Rotate only once another record is due, so no empty part files are left behind.
+                if count and self.max_bytes and handle.tell() >= self.max_bytes:
+                    handle.close()
+                    self._rotate(self._new_path("catalogue", now, count), now)
+                    handle = open(self._path, "a", newline="", encoding="utf-8")
+                    write_record = _record_writer(self.fmt, handle)
+                write_record(record)
+                count += 1
+        finally:
+            handle.close()
+        _LOGGER.debug(f"Exported {count} records to {self._path}")
+        return count
+
+    def dump(self, records: Iterable[dict], now: datetime, fmt: Optional[str] = None) -> str:
+        """Write records to a fresh snapshot file and return its path."""
+        fmt = fmt or self.fmt
+        if fmt not in FILE_EXTENSIONS:
+            raise ExportError(f"Unsupported export format: {fmt}")
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._new_path("snapshot", now, fmt=fmt)
+        if fmt == "parquet":
+            parquet = _ParquetFile(path)
+            try:
+                for batch in _batched(records, PARQUET_BATCH_SIZE):
+                    parquet.write(batch)
+            finally:
+                parquet.close()
+            return path
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            write_record = _record_writer(fmt, handle)
+            for record in records:
+                write_record(record)
+        return path
+
+    def close(self) -> None:
+        """Finalise the open Parquet file, a later write starts a new one."""
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    def _write_parquet(self, records: Iterable[dict], now: datetime) -> int:
+        count = 0
+        for batch in _batched(records, PARQUET_BATCH_SIZE):
+            if count and self.max_bytes and self._parquet.size >= self.max_bytes:
+                self._rotate(self._new_path("catalogue", now, count), now)
+            if self._parquet is None:
+                self._parquet = _ParquetFile(self._path)
+            self._parquet.write(batch)
+            count += len(batch)
+        _LOGGER.debug(f"Exported {count} records to {self._path}")
+        return count
+
+    def _rotate(self, path: str, now: datetime) -> None:
+        self.close()
+        self._path = path
+        self._opened_at = now
+
+    def _should_rotate(self, now: datetime) -> bool:
+        if self._path is None:
+            return True
+        if self.fmt == "parquet":
+            if self._parquet is None:
+                # Nothing open to append to, closed Parquet files are never reopened.
+                return True
+            size = self._parquet.size
+        elif not os.path.exists(self._path):
+            return True
+        else:
+            size = os.path.getsize(self._path)
+        if self.rotate_interval and now - self._opened_at >= self.rotate_interval:
+            return True
+        return bool(self.max_bytes and size >= self.max_bytes)
+
+    def _new_path(self, prefix: str, now: datetime, part: int = 0, fmt: Optional[str] = None) -> str:
+        suffix = f"-{part}" if part else ""
+        name = f"{prefix}-{now.strftime('%Y%m%dT%H%M%S')}{suffix}.{FILE_EXTENSIONS[fmt or self.fmt]}"
+        return os.path.join(self.directory, name)
+
+
+def _record_writer(fmt: str, handle):
+    """Return a callable writing a single record to handle in the given format."""
+    if fmt == "ndjson":
+        def write_json(record: dict) -> None:
+            handle.write(json.dumps(record, ensure_ascii=False))
+            handle.write("\n")
+        return write_json
+
+    writer = csv.DictWriter(handle, fieldnames=EXPORT_FIELDS)
+    if handle.tell() == 0:
+        writer.writeheader()
+    return writer.writerow
+
+
+def _batched(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class _ParquetFile:
+    """A Parquet file written one record batch at a time."""
+
+    def __init__(self, path: str) -> None:
+        """Open the file, pyarrow is only imported once Parquet is used."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise ExportError("Parquet export requires the pyarrow package") from err
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ("fetched_at", pa.string()),
+            ("weight_code", pa.string()),
+            ("weight", pa.string()),
+            ("name", pa.string()),
+            ("price", pa.float64()),
+            ("mwst_price", pa.float64()),
+            ("tax_rate", pa.float64()),
+            ("zero_tax", pa.bool_()),
+            ("available", pa.bool_()),
+            ("availability", pa.string()),
+            ("qty", pa.int64()),
+            ("url", pa.string()),
+        ])
+        self._sink = pa.OSFile(path, "wb")
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="zstd")
+
+    @property
+    def size(self) -> int:
+        """Return the bytes written so far, excluding the footer added on close."""
+        return self._sink.tell()
+
+    def write(self, records: List[dict]) -> None:
+        self._writer.write_batch(self._pa.RecordBatch.from_pylist(records, schema=self._schema))
+
+    def close(self) -> None:
+        try:
+            self._writer.close()
+        finally:
+            self._sink.close()
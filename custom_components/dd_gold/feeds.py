@@ -0,0 +1,366 @@
+import codecs
+import json
+import logging
+import re
+from typing import Iterator, List, Optional
+from xml.etree.ElementTree import XMLPullParser
+
+from bs4 import BeautifulSoup
+
+from .const import WEIGHT_OUNCES
+
+_LOGGER = logging.getLogger(__name__)
+
+FEED_CHUNK_SIZE = 64 * 1024
+SNIFF_SIZE = 1024  # bytes looked at to tell XML, HTML and JSON apart
+
+PRODUCT_TAGS = {"item", "entry", "product"}
+QTY_TAGS = {"quantity", "stock_quantity", "inventory", "qty"}
+
+# Fractions are matched as a whole token so "1/10 oz" cannot yield 10 oz.
+_WEIGHT_RE = re.compile(r'(?<![\d/.,])(\d+/\d+|½|\d+(?:[.,]\d+)?)(?![\d/])\s*(?:oz|unzen?|ounces?)\b')
+_PRICE_RE = re.compile(r'\d+(?:[.,]\d+)*')
+_THOUSANDS_RE = re.compile(r'[1-9]\d{0,2}[.,]\d{3}')
+_HTML_RE = re.compile(rb'<(?:!doctype\s+html|html)[\s>]', re.IGNORECASE)
+_JSON_STRUCTURE_RE = re.compile(r'[{}\[\]"]')
+_JSON_STRING_END_RE = re.compile(r'["\\]')
+
+
+def classify_weight(text: str) -> Optional[str]:
+    """Return the weight code of a product from its name or category text."""
+    for match in _WEIGHT_RE.finditer(text.lower()):
+        value = match.group(1)
+        if value == "½":
+            ounces = 0.5
+        elif "/" in value:
+            numerator, denominator = value.split("/")
+            if not int(denominator):
+                continue
+            ounces = int(numerator) / int(denominator)
+        else:
+            ounces = float(value.replace(",", "."))
+        for weight_code, weight_ounces in WEIGHT_OUNCES.items():
+            if ounces == weight_ounces:
+                return weight_code
+    return None
+
+
+def parse_price(value) -> Optional[float]:
+    """Parse prices like '35.90 EUR', '1.234,50 €', '1.234 €' or 35.9."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _PRICE_RE.search(str(value or ""))
+    if not match:
+        return None
+    number = match.group(0)
+    if _THOUSANDS_RE.fullmatch(number):
+        # A single separator followed by exactly three digits groups thousands.
+        return float(number[:-4] + number[-3:])
+    # The last separator is the decimal one, repeated separators group thousands.
+    decimal = "," if number.rfind(",") > number.rfind(".") else "."
+    number = number.replace("." if decimal == "," else ",", "")
+    if number.count(decimal) > 1:
+        number = number.replace(decimal, "")
+    return float(number.replace(",", "."))
+
+
+def parse_qty(value) -> Optional[int]:
+    """Parse a stock quantity, None if the feed does not report one."""
+    qty = parse_price(value) if value is not None else None
+    return int(qty) if qty is not None else None
+
+
+def parse_stock(value) -> Optional[bool]:
+    """Map availability values of product feeds and schema.org to in stock or not."""
+    text = str(value or "").lower().replace("_", "").replace(" ", "")
+    if not text:
+        return None
+    if any(x in text for x in ("outofstock", "soldout", "discontinued")):
+        return False
+    if any(x in text for x in ("instock", "limitedavailability", "onlineonly")):
+        return True
+    return None
+
+
+class ProductFeedParser:
+    """Incremental parser turning an XML, JSON or HTML product feed into raw products.
+
+    Chunks are fed as they arrive so the whole feed is never held in memory.
+    XML feeds (RSS/Atom shopping feeds or plain <product> lists) are read with
+    a pull parser, JSON feeds (JSON Lines, arrays or JSON-LD documents) are
+    split into top level objects or "@graph" elements and searched for
+    schema.org Products.
+    HTML pages are buffered and searched for embedded JSON-LD and itemprop
+    microdata Products.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self._format: Optional[str] = None
+        self._head = b""
+        self._xml: Optional[XMLPullParser] = None
+        self._json: Optional[_JsonObjectSplitter] = None
+        self._html: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        """Consume a chunk and return the products completed by it."""
+        if self._format is None:
+            self._head += chunk
+            if len(self._head) < SNIFF_SIZE:
+                return []
+            chunk = self._start(self._head)
+
+        if self._format == "xml":
+            self._xml.feed(chunk)
+            return self._read_xml_events()
+        if self._format == "json":
+            return [product for obj in self._json.feed(chunk) for product in _products_from_json(obj)]
+        self._html.append(chunk)
+        return []
+
+    def close(self) -> List[dict]:
+        """Flush the parser and return the remaining products."""
+        products = []
+        if self._format is None:
+            if not self._head.strip():
+                return []
+            products = self.feed(self._start(self._head))
+        if self._format == "xml":
+            self._xml.close()
+            return products + self._read_xml_events()
+        if self._format == "json":
+            return products + [product for obj in self._json.close() for product in _products_from_json(obj)]
+        return _products_from_html(b"".join(self._html))
+
+    def _start(self, head: bytes) -> bytes:
+        """Pick the format from the start of the document and return the buffered bytes."""
+        stripped = head.lstrip(codecs.BOM_UTF8).lstrip()
+        if _HTML_RE.search(head):
+            self._format = "html"
+        elif stripped[:1] == b"<":
+            self._format = "xml"
+            self._xml = XMLPullParser(events=("end",))
+        else:
+            self._format = "json"
+            self._json = _JsonObjectSplitter()
+        self._head = b""
+        return head
+
+    def _read_xml_events(self) -> List[dict]:
+        products = []
+        for _event, element in self._xml.read_events():
+            if _local_name(element.tag) not in PRODUCT_TAGS:
+                continue
+            product = _product_from_xml(element)
+            if product:
+                products.append(product)
+            element.clear()
+        return products
+
+
+def parse_feed_file(path: str) -> List[dict]:
+    """Parse a local feed file chunk by chunk (blocking, run in the executor)."""
+    parser = ProductFeedParser()
+    products = []
+    with open(path, "rb") as handle:
+        while chunk := handle.read(FEED_CHUNK_SIZE):
+            products.extend(parser.feed(chunk))
+    products.extend(parser.close())
+    return products
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _product_from_xml(element) -> Optional[dict]:
+    # Only direct children describe the product itself, containers such as
+    # <g:shipping> carry a price and country of their own.
+    fields = {}
+    for child in element:
+        name = _local_name(child.tag)
+        if name == "tax":
+            rate = next((c.text.strip() for c in child if _local_name(c.tag) == "rate" and c.text), None)
+            if rate:
+                fields.setdefault("tax_rate", rate)
+        elif name == "shipping" or len(child):
+            continue
+        elif name == "link" and child.get("href"):
+            fields.setdefault("link", child.get("href"))
+        elif child.text and child.text.strip():
+            fields.setdefault(name, child.text.strip())
+
+    name = fields.get("title") or fields.get("name")
+    price = parse_price(fields.get("sale_price") or fields.get("price"))
+    if not name or price is None:
+        return None
+    qty = next((fields[tag] for tag in QTY_TAGS if tag in fields), None)
+    return {
+        "name": name,
+        "url": fields.get("link") or fields.get("url") or "",
+        "price": price,
+        "in_stock": parse_stock(fields.get("availability")),
+        "qty": parse_qty(qty),
+        "tax_rate": parse_price(fields.get("tax_rate")),
+        "category": " ".join(fields[tag] for tag in ("product_type", "google_product_category", "category") if tag in fields),
+    }
+
+
+def _products_from_html(document: bytes) -> List[dict]:
+    """Extract embedded JSON-LD and itemprop microdata Products from an HTML page."""
+    soup = BeautifulSoup(document, "html.parser")
+    products = []
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError as ve:
+            _LOGGER.debug(f"Invalid JSON-LD block: {ve}")
+            continue
+        products.extend(_products_from_json(data))
+
+    for item in soup.find_all(attrs={"itemtype": re.compile(r"schema\.org/Product$")}):
+        name_el = item.find(attrs={"itemprop": "name"})
+        price_el = item.find(attrs={"itemprop": "price"})
+        if not name_el or not price_el:
+            continue
+        price = parse_price(price_el.get("content") or price_el.get_text(strip=True))
+        if price is None:
+            continue
+        url_el = item.find(attrs={"itemprop": "url"})
+        avail_el = item.find(attrs={"itemprop": "availability"})
+        inventory_el = item.find(attrs={"itemprop": "inventoryLevel"})
+        category_el = item.find(attrs={"itemprop": "category"})
+        products.append({
+            "name": name_el.get("content") or name_el.get_text(strip=True),
+            "url": (url_el.get("href") or url_el.get("content") or "") if url_el else "",
+            "price": price,
+            "in_stock": parse_stock(avail_el.get("href") or avail_el.get("content")) if avail_el else None,
+            "qty": parse_qty(inventory_el.get("content") or inventory_el.get_text(strip=True)) if inventory_el else None,
+            "tax_rate": None,
+            "category": category_el.get("content") or category_el.get_text(strip=True) if category_el else "",
+        })
+    return products
+
+
+def _iter_json_products(node) -> Iterator[dict]:
+    if isinstance(node, list):
+        for value in node:
+            yield from _iter_json_products(value)
+    elif isinstance(node, dict):
+        types = node.get("@type", [])
+        if "Product" in ([types] if isinstance(types, str) else types):
+            yield node
+            return
+        for value in node.values():
+            yield from _iter_json_products(value)
+
+
+def _products_from_json(obj) -> Iterator[dict]:
+    for node in _iter_json_products(obj):
+        offers = node.get("offers") or {}
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+        price = parse_price(offers.get("price", offers.get("lowPrice")))
+        if not node.get("name") or price is None:
+            continue
+        inventory = offers.get("inventoryLevel")
+        if isinstance(inventory, dict):
+            inventory = inventory.get("value")
+        category = node.get("category", "")
+        yield {
+            "name": node["name"],
+            "url": node.get("url") or offers.get("url") or "",
+            "price": price,
+            "in_stock": parse_stock(offers.get("availability")),
+            "qty": parse_qty(inventory),
+            "tax_rate": None,
+            "category": " ".join(category) if isinstance(category, list) else str(category),
+        }
+
+
+class _JsonObjectSplitter:
+    """Split a JSON stream into its top level objects or top level array elements.
+
+    The elements of a JSON-LD "@graph" array are split out as well, the rest of
+    the enclosing document (e.g. its "@context") is dropped.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._start: Optional[int] = None
+        self._start_depth = 0
+        self._in_array = False
+        self._in_graph = False
+        self._key: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> list:
+        self._buffer += self._decoder.decode(chunk)
+        buffer = self._buffer
+        objects = []
+        pos = self._pos
+        while True:
+            match = _JSON_STRUCTURE_RE.search(buffer, pos)
+            if not match:
+                pos = len(buffer)
+                break
+            char = match.group(0)
+            pos = match.end()
+            if char == '"':
+                end = self._skip_string(buffer, pos)
+                if end is None:
+                    # Unterminated string, rescan it once more data arrived.
+                    pos = match.start()
+                    break
+                if self._depth == 1 and not self._in_array:
+                    self._key = buffer[match.start():end]
+                pos = end
+            elif char in "{[":
+                if char == "[" and self._depth == 0:
+                    self._in_array = True
+                elif char == "[" and self._depth == 1 and not self._in_array and self._key == '"@graph"':
+                    # Stream the graph elements instead of buffering the whole document.
+                    self._in_graph = True
+                    self._start = None
+                elif char == "{" and self._start is None and (
+                    self._depth == 0 or (self._depth == 1 and self._in_array) or (self._depth == 2 and self._in_graph)
+                ):
+                    self._start = match.start()
+                    self._start_depth = self._depth
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._start is not None and self._depth == self._start_depth:
+                    objects.append(json.loads(buffer[self._start:pos]))
+                    self._start = None
+                if self._depth == 1:
+                    self._in_graph = False
+                elif self._depth == 0:
+                    self._in_array = False
+
+        keep = self._start if self._start is not None else pos
+        self._buffer = buffer[keep:]
+        self._pos = pos - keep
+        if self._start is not None:
+            self._start = 0
+        return objects
+
+    def close(self) -> list:
+        objects = self.feed(self._decoder.decode(b"", final=True).encode())
+        if self._start is not None:
+            _LOGGER.warning("Product feed ended inside an unterminated JSON object")
+        return objects
+
+    @staticmethod
+    def _skip_string(buffer: str, pos: int) -> Optional[int]:
+        while True:
+            match = _JSON_STRING_END_RE.search(buffer, pos)
+            if not match:
+                return None
+            if match.group(0) == '"':
+                return match.end()
+            pos = match.end() + 1
+            if pos > len(buffer):
+                return None
@@ -22,7 +22,7 @@ async def async_setup_entry(
 class DresdenGoldNumber(CoordinatorEntity, NumberEntity):
     """Base number entity for Dresden Gold config."""
 
-    def __init__(self, coordinator: DresdenGoldCoordinator, name: str, unique_id: str, icon: str, min_value: float, max_value: float, step: float, value: float) -> None:
+    def __init__(self, coordinator: DresdenGoldCoordinator, name: str, unique_id: str, icon: str, min_value: float, max_value: float, step: float, attribute: str) -> None:
         """Initialize the number."""
         super().__init__(coordinator)
         self._attr_name = name
@@ -31,7 +31,7 @@ class DresdenGoldNumber(CoordinatorEntity, NumberEntity):
         self._attr_native_min_value = min_value
         self._attr_native_max_value = max_value
         self._attr_native_step = step
-        self._attr_native_value = value
+        self._attribute = attribute
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, "dresden_gold_config")},
             name="Dresden Gold Configuration",
@@ -42,6 +42,11 @@ class DresdenGoldNumber(CoordinatorEntity, NumberEntity):
             configuration_url="https://www.dresden.gold",
         )
 
+    @property
+    def native_value(self) -> float:
+        """Return the value currently applied by the coordinator."""
+        return getattr(self.coordinator, self._attribute)
+
 class DresdenGoldMinPriceNumber(DresdenGoldNumber):
     """Number for min price."""
 
@@ -54,14 +59,12 @@ class DresdenGoldMinPriceNumber(DresdenGoldNumber):
             0,
             1000,
             0.1,
-            coordinator.min_price
+            "min_price",
         )
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
-        self._attr_native_value = value
         self.coordinator.update_config(min_price=value)
-        await self.coordinator.async_request_refresh()
 
 class DresdenGoldMaxPriceNumber(DresdenGoldNumber):
     """Number for max price."""
@@ -75,14 +78,12 @@ class DresdenGoldMaxPriceNumber(DresdenGoldNumber):
             0,
             1000,
             0.1,
-            coordinator.max_price
+            "max_price",
         )
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
-        self._attr_native_value = value
         self.coordinator.update_config(max_price=value)
-        await self.coordinator.async_request_refresh()
 
 class DresdenGoldMaxCoinsNumber(DresdenGoldNumber):
     """Number for max coins."""
@@ -96,11 +97,9 @@ class DresdenGoldMaxCoinsNumber(DresdenGoldNumber):
             5,
             500,
             1,
-            coordinator.max_coins
+            "max_coins",
         )
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
-        self._attr_native_value = value
-        self.coordinator.update_config(max_coins=int(value))
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+        self.coordinator.update_config(max_coins=int(value))
\ No newline at end of file
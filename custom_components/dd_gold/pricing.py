@@ -0,0 +1,69 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .const import WEIGHT_CODES, WEIGHT_OUNCES
+
+TROY_OUNCE_GRAMS = 31.1034768
+
+
+class CatalogueFrame:
+    """Columnar view of all catalogue coins across every weight."""
+
+    def __init__(self, coins: List[dict]) -> None:
+        """Build the column arrays from the scraped coin dicts."""
+        count = len(coins)
+        self.coins = coins
+        self.price = np.fromiter((float(c["price"]) for c in coins), dtype=np.float64, count=count)
+        self.mwst_price = np.fromiter((float(c["mwst_price"]) for c in coins), dtype=np.float64, count=count)
+        self.ounces = np.fromiter((WEIGHT_OUNCES.get(c["weight_code"], np.nan) for c in coins), dtype=np.float64, count=count)
+        self.weight_index = np.fromiter((WEIGHT_CODES.index(c["weight_code"]) for c in coins), dtype=np.int16, count=count)
+        self.zero_tax = np.fromiter((bool(c.get("zero_tax", False)) for c in coins), dtype=bool, count=count)
+        self.available = np.fromiter((bool(c.get("available", True)) for c in coins), dtype=bool, count=count)
+
+        self.net_price = self.price - self.mwst_price
+        self.price_per_oz = self.price / self.ounces
+        self.price_per_gram = self.price_per_oz / TROY_OUNCE_GRAMS
+        self.net_price_per_oz = self.net_price / self.ounces
+        self.premium = np.full(count, np.nan)
+
+    @classmethod
+    def from_catalogue(cls, catalogue: Dict[str, List[dict]]) -> "CatalogueFrame":
+        """Flatten the per-weight catalogue into a single frame."""
+        return cls([coin for weight in WEIGHT_CODES for coin in catalogue.get(weight, [])])
+
+    def __len__(self) -> int:
+        return len(self.coins)
+
+    def apply_spot_price(self, spot_price: Optional[float]) -> None:
+        """Compute the premium over spot in percent for every coin."""
+        if spot_price and spot_price > 0:
+            self.premium = (self.price_per_oz / spot_price - 1.0) * 100.0
+        else:
+            self.premium = np.full(len(self), np.nan)
+
+    def mask(self, min_price: float, max_price: float, require_zero_tax: bool) -> np.ndarray:
+        """Return the boolean mask of coins passing the configured filters."""
+        mask = self.available & (self.price >= min_price) & (self.price <= max_price)
+        if require_zero_tax:
+            mask &= self.zero_tax
+        return mask
+
+    def ranked(self, mask: np.ndarray, column: np.ndarray, weight: Optional[str] = None) -> np.ndarray:
+        """Return the indices selected by mask, optionally within one weight, ordered by column."""
+        if weight is not None:
+            mask = mask & (self.weight_index == WEIGHT_CODES.index(weight))
+        indices = np.flatnonzero(mask & ~np.isnan(column))
+        return indices[np.argsort(column[indices], kind="stable")]
+
+    def coin(self, index: int) -> dict:
+        """Return the coin dict at index enriched with the normalised prices."""
+        premium = self.premium[index]
+        return {
+            **self.coins[index],
+            "price_per_oz": f"{self.price_per_oz[index]:.2f}",
+            "price_per_gram": f"{self.price_per_gram[index]:.4f}",
+            "net_price": f"{self.net_price[index]:.2f}",
+            "net_price_per_oz": f"{self.net_price_per_oz[index]:.2f}",
+            "premium": "" if np.isnan(premium) else f"{premium:.2f}",
+        }
@@ -1,10 +1,12 @@
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import DeviceInfo
-from .const import DOMAIN, WEIGHT_CODES, WEIGHT_DISPLAY
+from .const import DOMAIN, WEIGHT_CODES, WEIGHT_DISPLAY, SIGNAL_WEIGHTS_UPDATED
 from .coordinator import DresdenGoldCoordinator
 import json
 
@@ -14,13 +16,36 @@ async def async_setup_entry(
     """Set up the sensor platform."""
     coordinator: DresdenGoldCoordinator = hass.data[DOMAIN][entry.entry_id]
     entities = []
-    for weight in WEIGHT_CODES:
-        entities.append(DresdenGoldCoinsSensor(coordinator, weight))
-        entities.append(DresdenGoldMinSensor(coordinator, weight))
-        entities.append(DresdenGoldMaxSensor(coordinator, weight))
-        entities.append(DresdenGoldAverageSensor(coordinator, weight))
+    for weight in coordinator.weights:
+        entities.extend(sensor_class(coordinator, weight) for sensor_class in WEIGHT_SENSORS)
+    entities.append(DresdenGoldBestValueSensor(coordinator))
+    entities.append(DresdenGoldBestNetValueSensor(coordinator))
+    entities.append(DresdenGoldBestPremiumSensor(coordinator))
     async_add_entities(entities)
 
+    @callback
+    def async_update_weights(added: list[str], removed: list[str]) -> None:
+        """Add and remove weight sensors after the weight selection changed."""
+        async_add_entities(
+            [sensor_class(coordinator, weight) for weight in added for sensor_class in WEIGHT_SENSORS]
+        )
+        entity_registry = er.async_get(hass)
+        device_registry = dr.async_get(hass)
+        for weight in removed:
+            for sensor_class in WEIGHT_SENSORS:
+                entity_id = entity_registry.async_get_entity_id(
+                    "sensor", DOMAIN, f"dresden_gold_{weight}_{sensor_class.sensor_type}"
+                )
+                if entity_id:
+                    entity_registry.async_remove(entity_id)
+            device = device_registry.async_get_device(identifiers={(DOMAIN, f"dresden_gold_{weight}")})
+            if device:
+                device_registry.async_update_device(device.id, remove_config_entry_id=entry.entry_id)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_WEIGHTS_UPDATED.format(entry.entry_id), async_update_weights)
+    )
+
 class DresdenGoldBaseSensor(CoordinatorEntity, SensorEntity):
     """Base sensor for Dresden Gold."""
 
@@ -30,7 +55,7 @@ class DresdenGoldBaseSensor(CoordinatorEntity, SensorEntity):
         self._weight = weight
         self._attr_icon = "mdi:gold"
         self._attr_unique_id = f"dresden_gold_{weight}_{self.sensor_type}"
-        self._attr_name = f"Dresden Gold {WEIGHT_DISPLAY.get(weight, weight)} {self.sensor_type.capitalize()}"
+        self._attr_name = f"Dresden Gold {WEIGHT_DISPLAY.get(weight, weight)} {getattr(self, 'sensor_name', self.sensor_type.capitalize())}"
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, f"dresden_gold_{weight}")},
             name=f"Dresden Gold {WEIGHT_DISPLAY.get(weight, weight)}",
@@ -71,6 +96,7 @@ class DresdenGoldCoinsSensor(DresdenGoldBaseSensor):
             attrs[f"coin_{i}_mwst_price"] = coin["mwst_price"]
             attrs[f"coin_{i}_tax_rate"] = coin["tax_rate"]
             attrs[f"coin_{i}_weight"] = coin["weight"]
+            attrs[f"coin_{i}_price_per_oz"] = coin.get("price_per_oz", "")
             attrs[f"coin_{i}_qty"] = coin.get("qty", "0")
             attrs[f"coin_{i}_url"] = coin["url"]
         return attrs
@@ -166,4 +192,229 @@ class DresdenGoldAverageSensor(DresdenGoldBaseSensor):
             "sample_size": str(self.data.get("total_coins", 0)),
             "price_range": f"{self.data.get('min_price', 0)}€ - {self.data.get('max_price', 0)}€",
             "last_update": self.coordinator.last_update_success_time.isoformat() if self.coordinator.last_update_success_time else None,
-        }
\ No newline at end of file
+        }
+
+class DresdenGoldAnalyticsSensor(DresdenGoldBaseSensor):
+    """Base sensor for rolling price analytics."""
+
+    @property
+    def stats(self):
+        return self.coordinator.analytics.weights.get(self._weight)
+
+    @property
+    def unit_of_measurement(self) -> str:
+        return "€"
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        stats = self.stats
+        if not stats:
+            return {}
+        return {
+            "samples": stats.samples,
+            "last_price": stats.last_price,
+            "last_update": self.coordinator.last_update_success_time.isoformat() if self.coordinator.last_update_success_time else None,
+        }
+
+class DresdenGoldEwmaSensor(DresdenGoldAnalyticsSensor):
+    """Sensor for the exponentially weighted average of the cheapest price."""
+
+    sensor_type = "ewma"
+    sensor_name = "EWMA"
+
+    @property
+    def state(self) -> float | None:
+        return round(self.stats.ewma, 2) if self.stats else None
+
+class DresdenGoldLow7dSensor(DresdenGoldAnalyticsSensor):
+    """Sensor for the rolling 7 day low of the cheapest price."""
+
+    sensor_type = "low_7d"
+    sensor_name = "7d Low"
+
+    @property
+    def state(self) -> float | None:
+        return self.stats.lows[self.sensor_type].minimum if self.stats else None
+
+class DresdenGoldLow30dSensor(DresdenGoldLow7dSensor):
+    """Sensor for the rolling 30 day low of the cheapest price."""
+
+    sensor_type = "low_30d"
+    sensor_name = "30d Low"
+
+class DresdenGoldVolatilitySensor(DresdenGoldAnalyticsSensor):
+    """Sensor for the volatility of the cheapest price."""
+
+    sensor_type = "volatility"
+
+    @property
+    def state(self) -> float | None:
+        return round(self.stats.volatility, 3) if self.stats else None
+
+    @property
+    def unit_of_measurement(self) -> str:
+        return "%"
+
+class DresdenGoldDepletionSensor(DresdenGoldBaseSensor):
+    """Sensor for the stock depletion rate of the listed products."""
+
+    sensor_type = "depletion"
+
+    @property
+    def state(self) -> float:
+        return round(sum(p.rate for p in self.coordinator.analytics.depletion(self._weight)), 2)
+
+    @property
+    def unit_of_measurement(self) -> str:
+        return "coins/h"
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        attrs = {
+            "last_update": self.coordinator.last_update_success_time.isoformat() if self.coordinator.last_update_success_time else None,
+        }
+        for i, product in enumerate(self.coordinator.analytics.depletion(self._weight)[:self.coordinator.max_coins], 1):
+            hours_left = product.hours_left
+            attrs[f"coin_{i}_name"] = product.name
+            attrs[f"coin_{i}_qty"] = product.qty
+            attrs[f"coin_{i}_rate"] = round(product.rate, 3)
+            attrs[f"coin_{i}_hours_left"] = round(hours_left, 1) if hours_left is not None else None
+        return attrs
+
+WEIGHT_SENSORS = [
+    DresdenGoldCoinsSensor,
+    DresdenGoldMinSensor,
+    DresdenGoldMaxSensor,
+    DresdenGoldAverageSensor,
+    DresdenGoldEwmaSensor,
+    DresdenGoldLow7dSensor,
+    DresdenGoldLow30dSensor,
+    DresdenGoldVolatilitySensor,
+    DresdenGoldDepletionSensor,
+]
+
+class DresdenGoldOverallSensor(CoordinatorEntity, SensorEntity):
+    """Base sensor ranking coins across all weights."""
+
+    def __init__(self, coordinator: DresdenGoldCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_icon = "mdi:scale-balance"
+        self._attr_unique_id = f"dresden_gold_overall_{self.sensor_type}"
+        self._attr_name = f"Dresden Gold {self.sensor_name}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, "dresden_gold_overall")},
+            name="Dresden Gold Overall",
+            manufacturer="Dresden Gold",
+            model="Silver Coin Tracker",
+            sw_version="1.0",
+            entry_type=None,
+            configuration_url="https://www.dresden.gold",
+        )
+
+    @property
+    def data(self):
+        return self.coordinator.data.get("overall", {})
+
+    @property
+    def best(self) -> dict | None:
+        coins = self.data.get("best_value", [])
+        return coins[0] if coins else None
+
+    def coin_attributes(self, coin: dict | None) -> dict:
+        if not coin:
+            return {}
+        return {
+            "coin_name": coin["name"],
+            "url": coin["url"],
+            "weight": coin["weight"],
+            "price": coin["price"],
+            "price_per_oz": coin["price_per_oz"],
+            "price_per_gram": coin["price_per_gram"],
+            "net_price_per_oz": coin["net_price_per_oz"],
+            "premium": coin["premium"],
+            "spot_price": self.data.get("spot_price"),
+            "last_update": self.coordinator.last_update_success_time.isoformat() if self.coordinator.last_update_success_time else None,
+        }
+
+class DresdenGoldBestValueSensor(DresdenGoldOverallSensor):
+    """Sensor for the lowest price per oz across all weights."""
+
+    sensor_type = "best_value"
+    sensor_name = "Best Value Per Oz"
+
+    @property
+    def state(self) -> float | None:
+        return float(self.best["price_per_oz"]) if self.best else None
+
+    @property
+    def unit_of_measurement(self) -> str:
+        return "€/oz"
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        attrs = self.coin_attributes(self.best)
+        for i, coin in enumerate(self.data.get("best_value", []), 1):
+            attrs[f"coin_{i}_name"] = coin["name"]
+            attrs[f"coin_{i}_weight"] = coin["weight"]
+            attrs[f"coin_{i}_price_per_oz"] = coin["price_per_oz"]
+        return attrs
+
+class DresdenGoldBestNetValueSensor(DresdenGoldOverallSensor):
+    """Sensor for the lowest price per oz excluding contained VAT."""
+
+    sensor_type = "best_net_value"
+    sensor_name = "Best Net Value Per Oz"
+
+    @property
+    def state(self) -> float | None:
+        coin = self.data.get("best_net_value")
+        return float(coin["net_price_per_oz"]) if coin else None
+
+    @property
+    def unit_of_measurement(self) -> str:
+        return "€/oz"
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return self.coin_attributes(self.data.get("best_net_value"))
+
+class DresdenGoldBestPremiumSensor(DresdenGoldOverallSensor):
+    """Sensor for the premium over spot of the best value coin."""
+
+    sensor_type = "best_premium"
+    sensor_name = "Best Premium Over Spot"
+
+    @property
+    def state(self) -> float | None:
+        if not self.best or not self.best["premium"]:
+            return None
+        return float(self.best["premium"])
+
+    @property
+    def unit_of_measurement(self) -> str:
+        return "%"
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return self.coin_attributes(self.best)
@@ -26,7 +26,6 @@ class DresdenGoldZeroTaxSwitch(CoordinatorEntity, SwitchEntity):
         self._attr_name = "Dresden Gold Require Zero Tax"
         self._attr_unique_id = "dresden_gold_require_zero_tax"
         self._attr_icon = "mdi:percent"
-        self._attr_is_on = coordinator.require_zero_tax
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, "dresden_gold_config")},
             name="Dresden Gold Configuration",
@@ -37,14 +36,15 @@ class DresdenGoldZeroTaxSwitch(CoordinatorEntity, SwitchEntity):
             configuration_url="https://www.dresden.gold",
         )
 
+    @property
+    def is_on(self) -> bool:
+        """Return the setting currently applied by the coordinator."""
+        return self.coordinator.require_zero_tax
+
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the entity on."""
-        self._attr_is_on = True
         self.coordinator.update_config(require_zero_tax=True)
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the entity off."""
-        self._attr_is_on = False
-        self.coordinator.update_config(require_zero_tax=False)
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+        self.coordinator.update_config(require_zero_tax=False)
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Fixtures for Dresden Gold tests."""
+from pathlib import Path
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.dd_gold.const import DOMAIN
+from custom_components.dd_gold.coordinator import DresdenGoldCoordinator
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def fixture_path():
+    """Return the path of a fixture file."""
+    return lambda name: str(FIXTURES / name)
+
+
+@pytest.fixture
+async def coordinator(hass):
+    """Return a coordinator for a config entry with default options."""
+    entry = MockConfigEntry(domain=DOMAIN, data={})
+    entry.add_to_hass(hass)
+    coordinator = DresdenGoldCoordinator(hass, entry)
+    yield coordinator
+    await coordinator.async_shutdown()
@@ -0,0 +1,163 @@
+"""Tests for the rolling analytics."""
+import math
+import statistics
+
+import pytest
+
+from custom_components.dd_gold.analytics import (
+    EWMA_HALF_LIFE,
+    DresdenGoldAnalytics,
+    ProductDepletion,
+    WeightAnalytics,
+    WindowMinimum,
+)
+from custom_components.dd_gold.const import DEFAULT_UPDATE_INTERVAL
+
+DAY = 24 * 3600
+RETURNS = [0.033, -0.067, 0.098, -0.065]
+
+
+def make_coin(name: str, price: float, url: str = "", qty: str = "", available: bool = True) -> dict:
+    """Return a catalogue coin with the fields the analytics read."""
+    return {"name": name, "price": f"{price:.2f}", "url": url, "qty": qty, "available": available}
+
+
+def test_window_minimum_expiry():
+    """Test that minima leave the window once they are older than it."""
+    window = WindowMinimum(100)
+    window.push(0, 30.0)
+    window.push(10, 35.0)
+    window.push(50, 32.0)
+    assert window.minimum == 30.0
+    assert window.as_list() == [[0, 30.0], [50, 32.0]]
+
+    window.push(100, 40.0)
+    assert window.minimum == 32.0
+    window.push(160, 45.0)
+    assert window.minimum == 40.0
+    window.push(300, 50.0)
+    assert window.minimum == 50.0
+
+
+@pytest.mark.parametrize(
+    ("elapsed", "expected"),
+    [
+        (0, 100.0),
+        (DEFAULT_UPDATE_INTERVAL, 100.0 + 10.0 * (1 - 0.5 ** (DEFAULT_UPDATE_INTERVAL / EWMA_HALF_LIFE))),
+        (EWMA_HALF_LIFE, 105.0),
+        (2 * EWMA_HALF_LIFE, 107.5),
+    ],
+)
+def test_ewma_time_decay(elapsed, expected):
+    """Test that the EWMA weighs an observation by the time since the previous one."""
+    stats = WeightAnalytics()
+    stats.update(0, 100.0)
+    stats.update(elapsed, 110.0)
+    assert stats.ewma == pytest.approx(expected)
+
+
+def test_volatility_known_returns():
+    """Test that the volatility matches the sample deviation from the first returns on."""
+    stats = WeightAnalytics()
+    price = 100.0
+    stats.update(0, price)
+    assert stats.volatility == 0.0
+    for step, log_return in enumerate(RETURNS, start=1):
+        price *= math.exp(log_return)
+        stats.update(step * DEFAULT_UPDATE_INTERVAL, price)
+        if step == 1:
+            # A single return carries no information about the spread.
+            assert stats.volatility == 0.0
+
+    assert stats.volatility == pytest.approx(statistics.stdev(RETURNS) * 100, rel=0.01)
+
+
+def test_volatility_normalises_gaps():
+    """Test that a return over a long gap is scaled to a single refresh interval."""
+    stats = WeightAnalytics()
+    stats.update(0, 100.0)
+    stats.update(4 * DEFAULT_UPDATE_INTERVAL, 100.0 * math.exp(0.02))
+    assert stats.return_sum / stats.return_weight == pytest.approx(0.01)
+
+
+def test_depletion_restock():
+    """Test that a restock resets the level without counting as negative demand."""
+    product = ProductDepletion({"name": "Maple", "weight_code": "1_oz", "last_time": 0, "qty": 20})
+    product.update(3600, 14)
+    assert product.rate == 6.0
+    assert product.hours_left == pytest.approx(14 / 6)
+
+    product.update(7200, 50)
+    assert (product.qty, product.rate) == (50, 6.0)
+
+    product.update(7200, 10)
+    assert (product.qty, product.rate) == (50, 6.0)
+
+
+def test_update_uses_unfiltered_available_catalogue():
+    """Test that the trends follow the cheapest available coin of every weight."""
+    analytics = DresdenGoldAnalytics()
+    analytics.update(0, {
+        "1_oz": [
+            make_coin("Maple Leaf 1 oz", 35.9),
+            make_coin("Krugerrand 1 oz", 33.5),
+            make_coin("Britannia 1 oz", 30.0, available=False),
+        ],
+        "2_oz": [make_coin("Panda 2 oz", 79.9, available=False)],
+    })
+    assert analytics.weights["1_oz"].last_price == 33.5
+    assert "2_oz" not in analytics.weights
+
+
+def test_depletion_key_without_url():
+    """Test that products without a link are told apart by weight and name."""
+    analytics = DresdenGoldAnalytics()
+    catalogue = {
+        "1_oz": [make_coin("Maple Leaf 1 oz", 35.9, qty="20"), make_coin("Krugerrand 1 oz", 33.5, qty="10")],
+        "2_oz": [make_coin("Maple Leaf 1 oz", 79.9, qty="5")],
+    }
+    analytics.update(0, catalogue)
+    catalogue["1_oz"][0]["qty"] = "14"
+    analytics.update(3600, catalogue)
+
+    assert sorted(analytics.products) == ["1_oz:Krugerrand 1 oz", "1_oz:Maple Leaf 1 oz", "2_oz:Maple Leaf 1 oz"]
+    assert [(p.name, p.rate) for p in analytics.depletion("1_oz")] == [
+        ("Maple Leaf 1 oz", 6.0),
+        ("Krugerrand 1 oz", 0.0),
+    ]
+
+
+def test_depletion_only_listed_products():
+    """Test that delisted products drop out of the depletion ranking."""
+    analytics = DresdenGoldAnalytics()
+    maple = make_coin("Maple Leaf 1 oz", 35.9, url="/maple.html", qty="20")
+    analytics.update(0, {"1_oz": [maple]})
+    analytics.update(3600, {"1_oz": [dict(maple, qty="14")]})
+    assert len(analytics.depletion("1_oz")) == 1
+    analytics.update(7200, {"1_oz": []})
+    assert analytics.depletion("1_oz") == []
+
+
+def test_persistence_round_trip():
+    """Test that the persisted state restores identical statistics."""
+    analytics = DresdenGoldAnalytics()
+    price = 35.0
+    for step, log_return in enumerate([0.0] + RETURNS):
+        price *= math.exp(log_return)
+        analytics.update(step * DEFAULT_UPDATE_INTERVAL, {
+            "1_oz": [make_coin("Maple Leaf 1 oz", price, url="/maple.html", qty=str(20 - step))],
+        })
+
+    restored = DresdenGoldAnalytics(analytics.as_dict())
+    assert restored.as_dict() == analytics.as_dict()
+    assert restored.last_update == analytics.last_update
+    stats, restored_stats = analytics.weights["1_oz"], restored.weights["1_oz"]
+    assert restored_stats.volatility == stats.volatility
+    assert restored_stats.ewma == stats.ewma
+    assert {key: w.minimum for key, w in restored_stats.lows.items()} == {key: w.minimum for key, w in stats.lows.items()}
+    assert [p.as_dict() for p in restored.depletion("1_oz")] == [p.as_dict() for p in analytics.depletion("1_oz")]
+
+    # Both continue identically after the restart.
+    for target in (analytics, restored):
+        target.update(5 * DEFAULT_UPDATE_INTERVAL + DAY, {"1_oz": [make_coin("Maple Leaf 1 oz", 36.0, url="/maple.html", qty="3")]})
+    assert restored.as_dict() == analytics.as_dict()
@@ -0,0 +1,172 @@
+"""Tests for the catalogue exporter."""
+import csv
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.dd_gold.export import (
+    EXPORT_FIELDS,
+    PARQUET_BATCH_SIZE,
+    CatalogueExporter,
+    iter_catalogue_records,
+)
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def make_records(count: int, fetched_at: datetime = NOW) -> list[dict]:
+    """Return export records of count 1 oz coins."""
+    coins = [
+        {
+            "name": f"Maple Leaf 1 oz Silber {index:04d}",
+            "price": "35.90",
+            "mwst_price": "0.00",
+            "weight": "1 oz",
+            "weight_code": "1_oz",
+            "tax_rate": "0.0",
+            "zero_tax": True,
+            "available": True,
+            "availability": "Auf Lager",
+            "qty": str(index),
+            "url": f"https://www.dresden.gold/maple-{index}.html",
+        }
+        for index in range(count)
+    ]
+    return list(iter_catalogue_records({"1_oz": coins}, fetched_at))
+
+
+def record_size(record: dict) -> int:
+    """Return the NDJSON size of a record in bytes."""
+    return len(json.dumps(record, ensure_ascii=False).encode()) + 1
+
+
+def read_ndjson(path) -> list[dict]:
+    """Return the records of an NDJSON file."""
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_size_rotation_mid_batch(tmp_path):
+    """Test that a batch exceeding the size limit continues in a new part file."""
+    records = make_records(10)
+    limit = 3 * record_size(records[0])
+    exporter = CatalogueExporter(str(tmp_path), "ndjson", max_size=limit / 1024 / 1024)
+
+    assert exporter.write(records, NOW) == 10
+    files = sorted(tmp_path.iterdir())
+    assert [f.name for f in files] == [
+        "catalogue-20240501T120000-3.ndjson",
+        "catalogue-20240501T120000-6.ndjson",
+        "catalogue-20240501T120000-9.ndjson",
+        "catalogue-20240501T120000.ndjson",
+    ]
+    assert [len(read_ndjson(f)) for f in files] == [3, 3, 1, 3]
+    assert [r["name"] for f in files[-1:] + files[:-1] for r in read_ndjson(f)] == [r["name"] for r in records]
+
+
+def test_no_empty_part_at_size_limit(tmp_path):
+    """Test that a batch ending exactly at the size limit leaves no empty part file."""
+    records = make_records(4)
+    limit = 4 * record_size(records[0])
+    exporter = CatalogueExporter(str(tmp_path), "ndjson", max_size=limit / 1024 / 1024)
+
+    exporter.write(records, NOW)
+    assert [f.name for f in tmp_path.iterdir()] == ["catalogue-20240501T120000.ndjson"]
+
+    # The next refresh starts a new file instead of growing the full one.
+    later = NOW + timedelta(minutes=5)
+    exporter.write(make_records(1, later), later)
+    assert sorted(f.name for f in tmp_path.iterdir()) == [
+        "catalogue-20240501T120000.ndjson",
+        "catalogue-20240501T120500.ndjson",
+    ]
+
+
+def test_time_rotation(tmp_path):
+    """Test that files rotate once they are older than the rotation interval."""
+    exporter = CatalogueExporter(str(tmp_path), "ndjson", rotate_hours=1)
+    for minutes in (0, 30, 59, 60, 90):
+        now = NOW + timedelta(minutes=minutes)
+        exporter.write(make_records(2, now), now)
+
+    files = sorted(tmp_path.iterdir())
+    assert [f.name for f in files] == [
+        "catalogue-20240501T120000.ndjson",
+        "catalogue-20240501T130000.ndjson",
+    ]
+    assert [len(read_ndjson(f)) for f in files] == [6, 4]
+
+
+def test_csv_header_only_on_new_files(tmp_path):
+    """Test that appending to a CSV file does not repeat the header."""
+    exporter = CatalogueExporter(str(tmp_path), "csv", rotate_hours=1)
+    exporter.write(make_records(2), NOW)
+    exporter.write(make_records(3), NOW + timedelta(minutes=5))
+    exporter.write(make_records(1), NOW + timedelta(hours=1))
+
+    first, second = sorted(tmp_path.iterdir())
+    with first.open(newline="", encoding="utf-8") as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0] == EXPORT_FIELDS
+    assert len(rows) == 6
+    assert EXPORT_FIELDS not in rows[1:]
+    with second.open(newline="", encoding="utf-8") as handle:
+        assert [row[:2] for row in csv.reader(handle)] == [["fetched_at", "weight_code"], [NOW.isoformat(), "1_oz"]]
+
+
+def test_dump_format_override(tmp_path):
+    """Test that a snapshot can be written in a format other than the exporter's."""
+    exporter = CatalogueExporter(str(tmp_path), "ndjson")
+    records = make_records(3)
+
+    path = exporter.dump(records, NOW, "csv")
+    assert path == str(tmp_path / "snapshot-20240501T120000.csv")
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [(row["name"], row["price"], row["zero_tax"]) for row in rows] == [
+        (r["name"], "35.9", "True") for r in records
+    ]
+
+    path = exporter.dump(records, NOW + timedelta(seconds=1))
+    assert path.endswith("snapshot-20240501T120001.ndjson")
+
+
+def test_parquet_rotation_period(tmp_path):
+    """Test that Parquet refreshes share one file per rotation period."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    exporter = CatalogueExporter(str(tmp_path), "parquet", rotate_hours=1)
+    exporter.write(make_records(PARQUET_BATCH_SIZE + 5), NOW)
+    exporter.write(make_records(7), NOW + timedelta(minutes=5))
+    exporter.write(make_records(2), NOW + timedelta(hours=1))
+    exporter.close()
+
+    first, second = sorted(tmp_path.iterdir())
+    assert first.name == "catalogue-20240501T120000.parquet"
+    table = pq.read_table(first)
+    assert table.num_rows == PARQUET_BATCH_SIZE + 12
+    assert table.column_names == EXPORT_FIELDS
+    assert table.column("qty").to_pylist()[-7:] == list(range(7))
+    assert pq.ParquetFile(first).metadata.num_row_groups == 3
+    assert pq.read_table(second).num_rows == 2
+
+
+def test_parquet_size_rotation(tmp_path):
+    """Test that a Parquet file is finalised once it exceeds the size limit."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    exporter = CatalogueExporter(str(tmp_path), "parquet", max_size=1 / 1024 / 1024)
+    exporter.write(make_records(2 * PARQUET_BATCH_SIZE + 1), NOW)
+    exporter.close()
+
+    assert sorted((f.name, pq.read_table(f).num_rows) for f in tmp_path.iterdir()) == [
+        (f"catalogue-20240501T120000-{PARQUET_BATCH_SIZE}.parquet", PARQUET_BATCH_SIZE),
+        (f"catalogue-20240501T120000-{2 * PARQUET_BATCH_SIZE}.parquet", 1),
+        ("catalogue-20240501T120000.parquet", PARQUET_BATCH_SIZE),
+    ]
+
+
+def test_parquet_dump(tmp_path):
+    """Test writing a Parquet snapshot from an NDJSON exporter."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    exporter = CatalogueExporter(str(tmp_path), "ndjson")
+    path = exporter.dump(make_records(3), NOW, "parquet")
+    assert pq.read_table(path).column("price").to_pylist() == [35.9, 35.9, 35.9]
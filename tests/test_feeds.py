@@ -0,0 +1,260 @@
+"""Tests for the structured product feed backend."""
+import json
+from pathlib import Path
+
+import pytest
+
+from custom_components.dd_gold.feeds import (
+    FEED_CHUNK_SIZE,
+    ProductFeedParser,
+    classify_weight,
+    parse_feed_file,
+    parse_price,
+)
+
+CHUNK_SIZES = [1, 2, 3, 7, FEED_CHUNK_SIZE]
+
+
+def parse_in_chunks(path: str, size: int) -> list[dict]:
+    """Feed a fixture to the parser in chunks of the given size."""
+    data = Path(path).read_bytes()
+    parser = ProductFeedParser()
+    products = []
+    for start in range(0, len(data), size):
+        products.extend(parser.feed(data[start:start + size]))
+    products.extend(parser.close())
+    return products
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_rss_feed(fixture_path, size):
+    """Test parsing an RSS shopping feed with g: fields."""
+    products = parse_in_chunks(fixture_path("feed.xml"), size)
+    assert [p["name"] for p in products] == [
+        "Maple Leaf 1 oz Silbermünze 2024",
+        "Känguru 10 Unzen Silbermünze 2024",
+        "Maple Leaf 1/10 oz Silber",
+        "Krugerrand 1 oz Goldmünze",
+        "Britannia ½ oz Silber 2024",
+        "Libertad 1 oz Silber 2024",
+    ]
+    maple, kangaroo, _, _, britannia, libertad = products
+    assert maple == {
+        "name": "Maple Leaf 1 oz Silbermünze 2024",
+        "url": "https://www.dresden.gold/maple-leaf-1-oz-silber-2024.html",
+        "price": 35.9,
+        "in_stock": True,
+        "qty": 12,
+        "tax_rate": 0.0,
+        "category": "Silber > Silbermünzen > 1 Unze",
+    }
+    assert kangaroo["price"] == 1234.0
+    assert kangaroo["in_stock"] is False
+    assert kangaroo["tax_rate"] == 19.0
+    assert kangaroo["url"] == "/kaenguru-10-unzen-silber-2024.html"
+    assert britannia["price"] == 19.9
+    # The shipping price listed before the item price must not be taken for it.
+    assert (libertad["price"], libertad["tax_rate"]) == (38.5, 7.0)
+    assert libertad["url"] == "https://www.dresden.gold/libertad-1-oz-silber-2024.html"
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_json_lines_feed(fixture_path, size):
+    """Test parsing a JSON Lines feed of schema.org Products."""
+    products = parse_in_chunks(fixture_path("feed.jsonl"), size)
+    assert [p["name"] for p in products] == [
+        'Panda 2 oz Silber {Jubiläum} "2024"',
+        "American Eagle 1 oz Silver \\ Proof",
+        "Libertad 5 oz Silber",
+    ]
+    panda, eagle, libertad = products
+    assert (panda["price"], panda["in_stock"], panda["qty"]) == (79.9, True, 4)
+    assert (eagle["price"], eagle["in_stock"], eagle["qty"]) == (41.5, False, None)
+    assert (libertad["price"], libertad["category"], libertad["url"]) == (189.0, "Silber 5 Unzen", "")
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_json_ld_document(fixture_path, size):
+    """Test parsing Products nested in a JSON-LD graph."""
+    products = parse_in_chunks(fixture_path("feed_jsonld.json"), size)
+    assert [(p["name"], p["price"], p["in_stock"], p["qty"]) for p in products] == [
+        ("Wiener Philharmoniker 1 oz Silber", 36.2, True, None),
+        ("Lunar Drache 2 oz Silber", 82.0, True, 1000),
+    ]
+
+
+def test_json_ld_graph_streaming():
+    """Test that JSON-LD graph elements are emitted before the document ends."""
+    parser = ProductFeedParser()
+    head = json.dumps({"@context": {"@vocab": "https://schema.org/", "note": "x" * 2000}})[:-1]
+    first = {"@type": "Product", "name": "Maple Leaf 1 oz Silber", "offers": {"price": "35.90"}}
+    second = {"@type": "Product", "name": "Libertad 5 oz Silber", "offers": {"price": "189.00"}}
+
+    assert parser.feed(f'{head}, "@graph": [{json.dumps(first)}, '.encode()) == [
+        {
+            "name": "Maple Leaf 1 oz Silber",
+            "url": "",
+            "price": 35.9,
+            "in_stock": None,
+            "qty": None,
+            "tax_rate": None,
+            "category": "",
+        }
+    ]
+    assert [p["name"] for p in parser.feed(json.dumps(second)[:40].encode())] == []
+    assert [p["name"] for p in parser.feed(f'{json.dumps(second)[40:]}], "name": "Shop"}}'.encode())] == [
+        "Libertad 5 oz Silber"
+    ]
+    assert parser.close() == []
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_html_page(fixture_path, size):
+    """Test extracting embedded JSON-LD and itemprop microdata from HTML."""
+    products = parse_in_chunks(fixture_path("product_page.html"), size)
+    assert [(p["name"], p["url"], p["price"], p["in_stock"], p["qty"]) for p in products] == [
+        ("Arche Noah 1 oz Silber 2024", "https://www.dresden.gold/arche-noah-1-oz.html", 34.5, True, None),
+        ("Koala 1 oz Silbermünze", "/koala-1-oz-silber.html", 37.8, True, 7),
+    ]
+
+
+@pytest.mark.parametrize(
+    "name", ["feed.xml", "feed.jsonl", "feed_jsonld.json", "product_page.html"]
+)
+def test_parse_feed_file(fixture_path, name):
+    """Test that reading a local file matches parsing it in small chunks."""
+    path = fixture_path(name)
+    assert parse_feed_file(path) == parse_in_chunks(path, 1)
+
+
+def test_empty_feed():
+    """Test that an empty document yields no products."""
+    parser = ProductFeedParser()
+    assert parser.feed(b"  \n") == []
+    assert parser.close() == []
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Maple Leaf 1 oz Silber", "1_oz"),
+        ("Känguru 10 Unzen Silber", "10_oz"),
+        ("Britannia 1/2 oz Silber", "0.5_oz"),
+        ("Britannia ½ oz Silber", "0.5_oz"),
+        ("Libertad 0,5 Unze Silber", "0.5_oz"),
+        ("Lunar 1,5 Unzen Silber", "1.5_oz"),
+        ("Silber 1/10 oz Maple", None),
+        ("Silber 1/4 oz Libertad", None),
+        ("Silber 1/0 oz", None),
+        ("Silberbarren 1 kg", None),
+        ("Jahrgang 2024 5 oz Silber", "5_oz"),
+    ],
+)
+def test_classify_weight(text, expected):
+    """Test classifying weights from product names."""
+    assert classify_weight(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("35.90 EUR", 35.9),
+        ("35,90 €", 35.9),
+        ("1.234,50 €", 1234.5),
+        ("1,234.50 EUR", 1234.5),
+        ("1.234 €", 1234.0),
+        ("1,234", 1234.0),
+        ("0,125", 0.125),
+        ("1.234.567", 1234567.0),
+        ("40", 40.0),
+        (41.5, 41.5),
+        ("", None),
+        (None, None),
+        ("auf Anfrage", None),
+    ],
+)
+def test_parse_price(value, expected):
+    """Test parsing prices in feed and display formats."""
+    assert parse_price(value) == expected
+
+
+async def test_coin_from_feed_product(coordinator, fixture_path):
+    """Test mapping feed products onto catalogue coins."""
+    products = parse_feed_file(fixture_path("feed.xml"))
+    coins = [coordinator.coin_from_feed_product(product) for product in products]
+    maple, kangaroo, tenth, gold, britannia, libertad = coins
+
+    assert maple == {
+        "name": "Maple Leaf 1 oz Silbermünze 2024",
+        "price": "35.90",
+        "mwst_price": "0.00",
+        "weight": "1 oz",
+        "weight_code": "1_oz",
+        "tax_rate": "0.0",
+        "zero_tax": True,
+        "available": True,
+        "availability": "Auf Lager",
+        "qty": "12",
+        "url": "https://www.dresden.gold/maple-leaf-1-oz-silber-2024.html",
+    }
+    # The description claims "steuerfrei", but only the structured rate counts.
+    assert kangaroo["zero_tax"] is False
+    assert kangaroo["mwst_price"] == "197.03"
+    assert kangaroo["tax_rate"] == "0.19"
+    assert kangaroo["available"] is False
+    assert kangaroo["availability"] == "Nicht verfügbar"
+    assert kangaroo["url"] == "https://www.dresden.gold/kaenguru-10-unzen-silber-2024.html"
+    assert tenth is None
+    assert gold is None
+    assert britannia["weight_code"] == "0.5_oz"
+    assert britannia["price"] == "19.90"
+    assert (libertad["price"], libertad["zero_tax"]) == ("38.50", False)
+
+
+async def test_coin_from_feed_product_default_vat(coordinator):
+    """Test that products without a tax field are assumed to include VAT."""
+    coin = coordinator.coin_from_feed_product(
+        {
+            "name": "Libertad 5 oz Silber",
+            "url": "",
+            "price": 119.0,
+            "in_stock": None,
+            "qty": None,
+            "tax_rate": None,
+            "category": "",
+        }
+    )
+    assert coin["zero_tax"] is False
+    assert coin["mwst_price"] == "19.00"
+    assert coin["availability"] == "Verfügbarkeit unbekannt"
+
+
+async def test_fetch_feed_coins_local_file(coordinator, fixture_path):
+    """Test that a local feed fills the weights it contains."""
+    coins = await coordinator.fetch_feed_coins(fixture_path("feed.jsonl"))
+    assert [(c["name"], c["weight_code"]) for c in coins] == [
+        ('Panda 2 oz Silber {Jubiläum} "2024"', "2_oz"),
+        ("American Eagle 1 oz Silver \\ Proof", "1_oz"),
+        ("Libertad 5 oz Silber", "5_oz"),
+    ]
+
+
+async def test_fetch_feed_coins_errors(coordinator, tmp_path, caplog):
+    """Test that missing or broken local feeds are logged instead of raised."""
+    broken_xml = tmp_path / "broken.xml"
+    broken_xml.write_text("<rss><channel><item><title>Maple 1 oz Silber</title></channel></rss>")
+    broken_json = tmp_path / "broken.jsonl"
+    broken_json.write_text('{"@type": "Product", "name": "Maple 1 oz Silber", "offers": {,}}\n')
+
+    assert await coordinator.fetch_feed_coins(str(tmp_path / "missing.xml")) == []
+    assert await coordinator.fetch_feed_coins(str(broken_xml)) == []
+    assert await coordinator.fetch_feed_coins(str(broken_json)) == []
+    assert caplog.text.count("Feed error for") == 3
+
+
+async def test_fetch_feed_coins_no_products(coordinator, tmp_path, caplog):
+    """Test that a document without products logs a warning."""
+    page = tmp_path / "page.html"
+    page.write_text("<!DOCTYPE html><html><body><p>Keine Produkte</p></body></html>")
+    assert await coordinator.fetch_feed_coins(str(page)) == []
+    assert "contained no products" in caplog.text
@@ -0,0 +1,105 @@
+"""Tests for the columnar catalogue frame."""
+import math
+
+import numpy as np
+import pytest
+
+from custom_components.dd_gold.pricing import TROY_OUNCE_GRAMS, CatalogueFrame
+
+
+def make_coin(name: str, weight_code: str, price: float, mwst_price: float = 0.0, **extra) -> dict:
+    """Return a catalogue coin dict as produced by the scrapers."""
+    return {
+        "name": name,
+        "price": f"{price:.2f}",
+        "mwst_price": f"{mwst_price:.2f}",
+        "weight_code": weight_code,
+        "zero_tax": mwst_price == 0,
+        "available": True,
+        **extra,
+    }
+
+
+CATALOGUE = {
+    "1_oz": [
+        make_coin("Maple Leaf 1 oz", "1_oz", 35.90),
+        make_coin("Krugerrand 1 oz", "1_oz", 33.50, mwst_price=5.35),
+        make_coin("Britannia 1 oz", "1_oz", 34.00, available=False),
+    ],
+    "10_oz": [make_coin("Känguru 10 oz", "10_oz", 329.00)],
+    "0.5_oz": [make_coin("Britannia ½ oz", "0.5_oz", 19.90)],
+}
+
+
+@pytest.mark.parametrize(
+    ("column", "weight", "expected"),
+    [
+        ("price_per_oz", None, ["Känguru 10 oz", "Krugerrand 1 oz", "Maple Leaf 1 oz", "Britannia ½ oz"]),
+        ("price", None, ["Britannia ½ oz", "Krugerrand 1 oz", "Maple Leaf 1 oz", "Känguru 10 oz"]),
+        ("net_price_per_oz", None, ["Krugerrand 1 oz", "Känguru 10 oz", "Maple Leaf 1 oz", "Britannia ½ oz"]),
+        ("price_per_oz", "1_oz", ["Krugerrand 1 oz", "Maple Leaf 1 oz"]),
+        ("price_per_oz", "2_oz", []),
+    ],
+)
+def test_ranked(column, weight, expected):
+    """Test ranking available coins by a price column across or within weights."""
+    frame = CatalogueFrame.from_catalogue(CATALOGUE)
+    indices = frame.ranked(frame.available, getattr(frame, column), weight)
+    assert [frame.coins[i]["name"] for i in indices] == expected
+
+
+@pytest.mark.parametrize(
+    ("spot_price", "expected"),
+    [
+        (None, ""),
+        (0.0, ""),
+        (-1.0, ""),
+        (30.0, "9.67"),
+    ],
+)
+def test_premium(spot_price, expected):
+    """Test the premium over spot, NaN and excluded from ranking without a spot price."""
+    frame = CatalogueFrame.from_catalogue(CATALOGUE)
+    frame.apply_spot_price(spot_price)
+    kangaroo = frame.ranked(frame.available, frame.price_per_oz)[0]
+    assert frame.coin(kangaroo)["premium"] == expected
+    if not expected:
+        assert np.isnan(frame.premium).all()
+        assert len(frame.ranked(frame.available, frame.premium)) == 0
+
+
+@pytest.mark.parametrize(
+    ("min_price", "max_price", "require_zero_tax", "expected"),
+    [
+        (0, 1000, False, ["Britannia ½ oz", "Maple Leaf 1 oz", "Krugerrand 1 oz", "Känguru 10 oz"]),
+        (0, 1000, True, ["Britannia ½ oz", "Maple Leaf 1 oz", "Känguru 10 oz"]),
+        (30, 40, False, ["Maple Leaf 1 oz", "Krugerrand 1 oz"]),
+        (30, 40, True, ["Maple Leaf 1 oz"]),
+        (35.9, 35.9, False, ["Maple Leaf 1 oz"]),
+        (500, 1000, False, []),
+    ],
+)
+def test_mask(min_price, max_price, require_zero_tax, expected):
+    """Test the price range, zero tax and availability filters."""
+    frame = CatalogueFrame.from_catalogue(CATALOGUE)
+    mask = frame.mask(min_price, max_price, require_zero_tax)
+    assert [coin["name"] for coin, selected in zip(frame.coins, mask) if selected] == expected
+
+
+def test_coin():
+    """Test the normalised prices added to a coin."""
+    frame = CatalogueFrame([make_coin("Krugerrand 1 oz", "1_oz", 33.50, mwst_price=5.35)])
+    coin = frame.coin(0)
+    assert coin["name"] == "Krugerrand 1 oz"
+    assert coin["price_per_oz"] == "33.50"
+    assert coin["price_per_gram"] == f"{33.5 / TROY_OUNCE_GRAMS:.4f}"
+    assert coin["net_price"] == "28.15"
+    assert coin["net_price_per_oz"] == "28.15"
+    assert coin["premium"] == ""
+
+
+def test_empty_catalogue():
+    """Test that an empty catalogue ranks nothing."""
+    frame = CatalogueFrame.from_catalogue({})
+    assert len(frame) == 0
+    assert frame.ranked(frame.mask(0, math.inf, False), frame.price_per_oz).tolist() == []